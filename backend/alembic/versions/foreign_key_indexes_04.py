@@ -0,0 +1,34 @@
+"""Index foreign key columns on lessons, exercises and submissions
+
+Revision ID: foreign_key_indexes_04
+Revises: exercise_generation_03
+Create Date: 2025-03-24 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'foreign_key_indexes_04'
+down_revision = 'exercise_generation_03'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_lessons_course_id', 'lessons', 'course_id'),
+    ('ix_exercises_lesson_id', 'exercises', 'lesson_id'),
+    ('ix_submissions_exercise_id', 'submissions', 'exercise_id'),
+    ('ix_submissions_user_id', 'submissions', 'user_id'),
+]
+
+
+def upgrade():
+    # Without these, deleting a parent row scans the whole child table
+    for name, table, column in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+
+
+def downgrade():
+    for name, _, _ in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -9,7 +9,8 @@ from .config import DATABASE_URL, DB_ECHO
 Base = declarative_base()
 
 # Database configuration using settings from config
-engine = create_async_engine(DATABASE_URL, echo=DB_ECHO)
+# Bulk ORM inserts are batched into multi-row INSERTs (insertmanyvalues) of up to 1000 rows
+engine = create_async_engine(DATABASE_URL, echo=DB_ECHO, insertmanyvalues_page_size=1000)
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 # Dependency for database session
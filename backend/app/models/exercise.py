@@ -21,7 +21,7 @@ class Exercise(Base):
     __tablename__ = "exercises"
     
     id = Column(Integer, primary_key=True, index=True)
-    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False)
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False, index=True)
     title = Column(String(255), nullable=True)
     exercise_type = Column(String(50), nullable=False)
     question = Column(Text, nullable=False)
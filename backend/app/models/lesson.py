@@ -24,7 +24,7 @@ class Lesson(Base):
     title = Column(String(255), index=True, nullable=False)
     content = Column(Text, nullable=False)
     description = Column(String(500), nullable=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=True, index=True)
     order_index = Column(Integer, default=0)
     is_published = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -51,6 +51,9 @@ except ImportError as e:
     print("Make sure you have all required packages installed.")
     sys.exit(1)
 
+# Matches the position before each interior capital letter (CamelCase -> camel_case)
+_CAMEL = re.compile(r"(?<!^)(?=[A-Z])")
+
 def parse_args():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Fix model-related issues in the LMS system")
@@ -65,14 +68,7 @@ def fix_schema(dry_run=False):
     """Fix database schema issues."""
     print("Fixing database schema issues...")
     
-    # Get database connection parameters
-    db_params = get_db_params()
-    
     try:
-        # Connect to the database
-        conn = psycopg2.connect(**db_params)
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-        
         # Find all models in the database module
         models_path = project_root / "database" / "models.py"
         
@@ -83,12 +79,20 @@ def fix_schema(dry_run=False):
         # Find model classes in the code
         model_classes = re.findall(r"class\s+(\w+)\(.*Base.*\):", models_code)
         
+        # A dry run only previews what would be checked, so skip the database entirely
+        if dry_run:
+            return _dry_run_schema_preview(model_classes)
+        
+        # Connect to the database
+        conn = psycopg2.connect(**get_db_params())
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        
         # Check each model against the database
         for model_name in model_classes:
             print(f"Checking model: {model_name}")
             
             # Get the table name (convert CamelCase to snake_case)
-            table_name = ''.join(['_'+c.lower() if c.isupper() else c for c in model_name]).lstrip('_')
+            table_name = _CAMEL.sub('_', model_name).lower()
             
             # Check if the table exists
             cursor.execute(f"""
@@ -103,12 +107,9 @@ def fix_schema(dry_run=False):
             
             if not table_exists:
                 print(f"Table {table_name} does not exist in the database")
-                if not dry_run:
-                    # This would normally run the migration to create the table
-                    print(f"  Would create table {table_name}")
-                    print("  (Not implemented in this script)")
-                else:
-                    print(f"  DRY RUN: Would create table {table_name}")
+                # This would normally run the migration to create the table
+                print(f"  Would create table {table_name}")
+                print("  (Not implemented in this script)")
             else:
                 # Check columns in the table
                 cursor.execute(f"""
@@ -118,7 +119,7 @@ def fix_schema(dry_run=False):
                     AND table_name = %s
                 """, (table_name,))
                 
-                db_columns = [row[0] for row in cursor.fetchall()]
+                db_columns = {row[0] for row in cursor.fetchall()}
                 
                 # Find column definitions in the model
                 column_pattern = r"(\w+)\s*=\s*Column\("
@@ -129,12 +130,9 @@ def fix_schema(dry_run=False):
                 
                 if missing_columns:
                     print(f"  Missing columns in table {table_name}: {', '.join(missing_columns)}")
-                    if not dry_run:
-                        # This would normally run the migration to add the columns
-                        print(f"  Would add columns to {table_name}")
-                        print("  (Not implemented in this script)")
-                    else:
-                        print(f"  DRY RUN: Would add columns to {table_name}")
+                    # This would normally run the migration to add the columns
+                    print(f"  Would add columns to {table_name}")
+                    print("  (Not implemented in this script)")
         
         cursor.close()
         conn.close()
@@ -146,6 +144,16 @@ def fix_schema(dry_run=False):
     
     return True
 
+def _dry_run_schema_preview(model_classes):
+    """Report the tables a schema check would inspect, without connecting to the database."""
+    for model_name in model_classes:
+        table_name = _CAMEL.sub('_', model_name).lower()
+        print(f"Checking model: {model_name}")
+        print(f"  DRY RUN: Would check table {table_name} and its columns in the database")
+    
+    print("Schema fix check completed")
+    return True
+
 def fix_model_save(dry_run=False):
     """Fix model save functionality."""
     print("Fixing model save functionality...")
@@ -22,13 +22,16 @@ Author: LMS Team
 Last Modified: 2025-03-19
 """
 
+import errno
 import os
+import selectors
 import sys
 import socket
 import subprocess
 import time
 import logging
 import argparse
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
@@ -46,17 +49,21 @@ except ImportError as e:
     print("Make sure you have all required packages installed.")
     sys.exit(1)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(os.path.join(project_root, 'logs', 'service_check.log'))
-    ]
-)
 logger = logging.getLogger("service_check")
 
+def _configure_logging():
+    """Configure console and file logging; the log file is only opened on first write."""
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler(log_dir / 'service_check.log', delay=True)
+        ]
+    )
+
 # Get environment variables with defaults
 def get_env_str(name, default):
     return os.environ.get(name, default)
@@ -68,25 +75,36 @@ def get_env_int(name, default):
     except (ValueError, TypeError):
         return default
 
+@dataclass(frozen=True, slots=True)
+class ServiceConfig:
+    """Connection settings for a single LMS service."""
+    name: str
+    host: str
+    port: int
+    url: str
+    health_endpoint: str = ""
+
+def make_service_config(name, host, port, health_endpoint=""):
+    """Build a ServiceConfig, pre-formatting its base URL once."""
+    return ServiceConfig(name, host, port, f"http://{host}:{port}", health_endpoint)
+
 # Service configurations
-SERVICE_CONFIG = {
-    "database": {
-        "name": "PostgreSQL Database",
-        "port": get_env_int("LMS_DB_PORT", 5432),
-        "host": get_env_str("LMS_DB_HOST", "localhost"),
-    },
-    "backend": {
-        "name": "FastAPI Backend",
-        "port": get_env_int("LMS_API_PORT", 8000),
-        "host": get_env_str("LMS_API_HOST", "localhost"),
-        "health_endpoint": "/health",
-    },
-    "frontend": {
-        "name": "Next.js Frontend",
-        "port": get_env_int("LMS_FRONTEND_PORT", 3000),
-        "host": get_env_str("LMS_FRONTEND_HOST", "localhost"),
-    }
-}
+DATABASE = make_service_config(
+    "PostgreSQL Database",
+    get_env_str("LMS_DB_HOST", "localhost"),
+    get_env_int("LMS_DB_PORT", 5432),
+)
+BACKEND = make_service_config(
+    "FastAPI Backend",
+    get_env_str("LMS_API_HOST", "localhost"),
+    get_env_int("LMS_API_PORT", 8000),
+    health_endpoint="/health",
+)
+FRONTEND = make_service_config(
+    "Next.js Frontend",
+    get_env_str("LMS_FRONTEND_HOST", "localhost"),
+    get_env_int("LMS_FRONTEND_PORT", 3000),
+)
 
 def parse_args():
     """Parse command-line arguments."""
@@ -97,19 +115,75 @@ def parse_args():
 
 def check_port(host, port):
     """Check if a TCP port is open."""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(2.0)
-    result = sock.connect_ex((host, port))
-    sock.close()
-    return result == 0
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(2.0)
+        return sock.connect_ex((host, port)) == 0
+
+def check_ports(addresses, timeout=2.0):
+    """Check several TCP ports in parallel.
+
+    All connections are started non-blocking and polled with a single selector,
+    so the total wait is bounded by ``timeout`` rather than growing per port.
+    Returns a dict mapping each (host, port) pair to True if it is open.
+    """
+    results = {address: False for address in addresses}
+    with selectors.DefaultSelector() as selector:
+        for address in results:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            try:
+                err = sock.connect_ex(address)
+            except OSError:
+                sock.close()
+                continue
+            if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                selector.register(sock, selectors.EVENT_WRITE, address)
+            else:
+                sock.close()
+
+        deadline = time.monotonic() + timeout
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(remaining):
+                sock = key.fileobj
+                results[key.data] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                selector.unregister(sock)
+                sock.close()
+
+        # Anything still registered timed out
+        for key in list(selector.get_map().values()):
+            selector.unregister(key.fileobj)
+            key.fileobj.close()
+    return results
+
+# Postgres SSLRequest packet: int32 length (8) followed by the magic code 80877103
+PG_SSL_REQUEST = b"\x00\x00\x00\x08\x04\xd2\x16\x2f"
+
+def check_database_alive():
+    """Check that Postgres is accepting connections without authenticating.
+
+    Sends an SSLRequest and waits for the single-byte reply, which any live
+    server answers with 'S', 'N' or 'E' before any auth or TLS negotiation.
+    """
+    try:
+        with socket.create_connection((DATABASE.host, DATABASE.port), timeout=2.0) as sock:
+            sock.sendall(PG_SSL_REQUEST)
+            reply = sock.recv(1)
+    except OSError as e:
+        return False, str(e)
+    if reply in (b"S", b"N", b"E"):
+        return True, "Accepting connections"
+    return False, f"Unexpected reply to SSLRequest: {reply!r}"
 
 def check_database():
     """Check if the database is running and accessible."""
     try:
         db_params = get_db_params()
         # Override with service config if needed
-        db_params["host"] = SERVICE_CONFIG["database"]["host"]
-        db_params["port"] = SERVICE_CONFIG["database"]["port"]
+        db_params["host"] = DATABASE.host
+        db_params["port"] = DATABASE.port
         
         # Try to connect to the database
         conn = psycopg2.connect(**db_params)
@@ -122,38 +196,43 @@ def check_database():
     except Exception as e:
         return False, str(e)
 
-def check_backend():
-    """Check if the backend API is running."""
-    host = SERVICE_CONFIG["backend"]["host"]
-    port = SERVICE_CONFIG["backend"]["port"]
-    health_endpoint = SERVICE_CONFIG["backend"]["health_endpoint"]
+def check_backend(port_open=None):
+    """Check if the backend API is running.
+
+    ``port_open`` may carry the result of an earlier parallel port probe.
+    """
+    if port_open is None:
+        port_open = check_port(BACKEND.host, BACKEND.port)
     
     # First check if the port is open
-    if not check_port(host, port):
+    if not port_open:
         return False, "Port is not open"
     
     # Then check the health endpoint if available
     try:
-        response = requests.get(f"http://{host}:{port}{health_endpoint}", timeout=5)
+        response = requests.get(BACKEND.url + BACKEND.health_endpoint, timeout=5)
         if response.status_code == 200:
             return True, f"Status code: {response.status_code}"
         return False, f"Unexpected status code: {response.status_code}"
     except requests.RequestException:
         # If health endpoint fails, just check if something is responding
         try:
-            response = requests.get(f"http://{host}:{port}/", timeout=5)
+            response = requests.get(BACKEND.url + "/", timeout=5)
             return True, "Service responding but health endpoint not available"
         except requests.RequestException as e:
             return False, str(e)
 
-def check_frontend():
-    """Check if the frontend service is running."""
-    host = SERVICE_CONFIG["frontend"]["host"]
-    port = SERVICE_CONFIG["frontend"]["port"]
+def check_frontend(port_open=None):
+    """Check if the frontend service is running.
+
+    ``port_open`` may carry the result of an earlier parallel port probe.
+    """
+    if port_open is None:
+        port_open = check_port(FRONTEND.host, FRONTEND.port)
     
-    if check_port(host, port):
+    if port_open:
         try:
-            response = requests.get(f"http://{host}:{port}/", timeout=5)
+            response = requests.get(FRONTEND.url + "/", timeout=5)
             return True, f"Status code: {response.status_code}"
         except requests.RequestException as e:
             return False, f"Port is open but HTTP request failed: {e}"
@@ -162,6 +241,7 @@ def check_frontend():
 def main():
     """Main function to check all services."""
     args = parse_args()
+    _configure_logging()
     
     if args.quiet:
         logger.setLevel(logging.ERROR)
@@ -170,29 +250,36 @@ def main():
     
     logger.info("Starting service health check")
     
+    # Probe the HTTP service ports together so their timeouts don't add up
+    open_ports = check_ports([(BACKEND.host, BACKEND.port), (FRONTEND.host, FRONTEND.port)])
+    
     # Check database
     logger.info("Checking database service...")
-    db_status, db_message = check_database()
+    # Only the verbose report needs the server version from a full login
+    if args.verbose:
+        db_status, db_message = check_database()
+    else:
+        db_status, db_message = check_database_alive()
     if db_status:
-        logger.info(f"✅ Database is running: {db_message}")
+        logger.info("✅ Database is running: %s", db_message)
     else:
-        logger.error(f"❌ Database check failed: {db_message}")
+        logger.error("❌ Database check failed: %s", db_message)
     
     # Check backend
     logger.info("Checking backend service...")
-    backend_status, backend_message = check_backend()
+    backend_status, backend_message = check_backend(open_ports[(BACKEND.host, BACKEND.port)])
     if backend_status:
-        logger.info(f"✅ Backend is running: {backend_message}")
+        logger.info("✅ Backend is running: %s", backend_message)
     else:
-        logger.error(f"❌ Backend check failed: {backend_message}")
+        logger.error("❌ Backend check failed: %s", backend_message)
     
     # Check frontend
     logger.info("Checking frontend service...")
-    frontend_status, frontend_message = check_frontend()
+    frontend_status, frontend_message = check_frontend(open_ports[(FRONTEND.host, FRONTEND.port)])
     if frontend_status:
-        logger.info(f"✅ Frontend is running: {frontend_message}")
+        logger.info("✅ Frontend is running: %s", frontend_message)
     else:
-        logger.error(f"❌ Frontend check failed: {frontend_message}")
+        logger.error("❌ Frontend check failed: %s", frontend_message)
     
     # Overall status
     all_ok = db_status and backend_status and frontend_status
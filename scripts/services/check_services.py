@@ -27,17 +27,21 @@ sys.path.append(str(project_root))
 from database.db_manager import get_db_params
 import psycopg2
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(project_root / "logs" / "service_check.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def _configure_logging():
+    """Configure file and console logging; the log file is only opened on first write."""
+    log_dir = project_root / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_dir / "service_check.log", delay=True),
+            logging.StreamHandler()
+        ]
+    )
+
 # Configuration from environment variables
 def get_service_config():
     """Get service configuration from environment variables or use defaults."""
@@ -58,7 +62,7 @@ def check_database():
         # Check connection
         cur.execute("SELECT version();")
         version = cur.fetchone()[0]
-        logger.info(f"✅ Database connected successfully")
+        logger.info("✅ Database connected successfully")
         
         # Check tables
         cur.execute("""
@@ -67,7 +71,7 @@ def check_database():
             WHERE schemaname = 'public'
         """)
         tables = [row[0] for row in cur.fetchall()]
-        logger.info(f"✅ Found {len(tables)} tables in database")
+        logger.info("✅ Found %s tables in database", len(tables))
         
         # Check running queries
         try:
@@ -79,11 +83,11 @@ def check_database():
             """)
             queries = cur.fetchall()
             if queries:
-                logger.info(f"Current active queries: {len(queries)}")
+                logger.info("Current active queries: %s", len(queries))
             else:
                 logger.info("No active queries.")
         except Exception as e:
-            logger.warning(f"Could not check active queries: {e}")
+            logger.warning("Could not check active queries: %s", e)
         
         # Clean up
         cur.close()
@@ -91,47 +95,83 @@ def check_database():
         
         return True
     except Exception as e:
-        logger.error(f"❌ Database connection error: {e}")
+        logger.error("❌ Database connection error: %s", e)
         return False
 
 def check_port(host, port, service_name):
     """Check if a port is open on the specified host."""
-    logger.info(f"Checking if {service_name} is running on port {port}...")
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(2)
-    try:
+    logger.info("Checking if %s is running on port %s...", service_name, port)
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(2)
         result = sock.connect_ex((host, port))
-        if result == 0:
-            logger.info(f"✅ {service_name} is running on port {port}")
+    if result == 0:
+        logger.info("✅ %s is running on port %s", service_name, port)
+        return True
+    else:
+        logger.error("❌ %s is not running on port %s", service_name, port)
+        return False
+
+def _process_running_in_proc(process_name):
+    """Scan /proc for a process whose command line contains process_name.
+
+    Raises FileNotFoundError on systems without a /proc filesystem.
+    """
+    own_pid = str(os.getpid())
+    needle = process_name.encode()
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit() or pid == own_pid:
+            continue
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                cmdline = f.read().replace(b'\x00', b' ')
+        except OSError:
+            # The process exited or is not readable
+            continue
+        if needle in cmdline:
             return True
-        else:
-            logger.error(f"❌ {service_name} is not running on port {port}")
-            return False
-    finally:
-        sock.close()
+    return False
 
 def check_process(process_name):
-    """Check if a process is running using grep."""
-    logger.info(f"Checking if {process_name} process is running...")
+    """Check if a process is running by scanning /proc, falling back to pgrep."""
+    logger.info("Checking if %s process is running...", process_name)
     try:
-        # Use pgrep to search for the process
-        result = subprocess.run(
-            ["pgrep", "-f", process_name],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        try:
+            running = _process_running_in_proc(process_name)
+        except FileNotFoundError:
+            # No /proc (e.g. macOS), use pgrep to search for the process
+            result = subprocess.run(
+                ["pgrep", "-f", process_name],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            running = result.returncode == 0
         
-        if result.returncode == 0:
-            logger.info(f"✅ Process {process_name} is running")
+        if running:
+            logger.info("✅ Process %s is running", process_name)
             return True
         else:
-            logger.error(f"❌ Process {process_name} is not running")
+            logger.error("❌ Process %s is not running", process_name)
             return False
     except Exception as e:
-        logger.error(f"❌ Error checking process {process_name}: {e}")
+        logger.error("❌ Error checking process %s: %s", process_name, e)
         return False
 
+def _memory_usage_percent():
+    """Return used memory as a percentage of total, from /proc/meminfo or `free -m`."""
+    try:
+        meminfo = {}
+        with open('/proc/meminfo') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                meminfo[key] = int(value.split()[0])
+        total = meminfo['MemTotal']
+        return (total - meminfo['MemAvailable']) * 100 / total
+    except FileNotFoundError:
+        result = subprocess.run(["free", "-m"], capture_output=True, text=True)
+        fields = result.stdout.splitlines()[1].split()
+        return int(fields[2]) * 100 / int(fields[1])
+
 def check_system_resources():
     """Check system resources like CPU, memory, and disk space."""
     logger.info("\n💻 Checking System Resources...")
@@ -140,48 +180,47 @@ def check_system_resources():
         # Check CPU usage
         cpu_usage = None
         try:
-            cpu_cmd = "top -bn1 | grep 'Cpu(s)' | awk '{print $2 + $4}'"
-            result = subprocess.run(cpu_cmd, shell=True, capture_output=True, text=True)
-            cpu_usage = result.stdout.strip()
-            logger.info(f"CPU usage: {cpu_usage}%")
+            result = subprocess.run(["top", "-bn1"], capture_output=True, text=True)
+            cpu_line = next(line for line in result.stdout.splitlines() if 'Cpu(s)' in line)
+            fields = cpu_line.split()
+            # User + system time
+            cpu_usage = f"{float(fields[1]) + float(fields[3]):g}"
+            logger.info("CPU usage: %s%%", cpu_usage)
             if cpu_usage and float(cpu_usage) > 90:
-                logger.warning(f"❌ CPU usage critical: {cpu_usage}%")
+                logger.warning("❌ CPU usage critical: %s%%", cpu_usage)
             else:
-                logger.info(f"✅ CPU usage OK: {cpu_usage}%")
+                logger.info("✅ CPU usage OK: %s%%", cpu_usage)
         except Exception as e:
-            logger.error(f"Could not check CPU usage: {e}")
+            logger.error("Could not check CPU usage: %s", e)
         
         # Check memory usage
         memory_usage = None
         try:
-            mem_cmd = "free -m | awk 'NR==2{printf \"%.2f\", $3*100/$2}'"
-            result = subprocess.run(mem_cmd, shell=True, capture_output=True, text=True)
-            memory_usage = result.stdout.strip()
-            logger.info(f"Memory usage: {memory_usage}%")
+            memory_usage = f"{_memory_usage_percent():.2f}"
+            logger.info("Memory usage: %s%%", memory_usage)
             if memory_usage and float(memory_usage) > 90:
-                logger.warning(f"❌ Memory usage critical: {memory_usage}%")
+                logger.warning("❌ Memory usage critical: %s%%", memory_usage)
             else:
-                logger.info(f"✅ Memory usage OK: {memory_usage}%")
+                logger.info("✅ Memory usage OK: %s%%", memory_usage)
         except Exception as e:
-            logger.error(f"Could not check memory usage: {e}")
+            logger.error("Could not check memory usage: %s", e)
         
         # Check disk usage
         disk_usage = None
         try:
-            disk_cmd = "df -h | awk '$NF==\"/\"{printf \"%s\", $5}'"
-            result = subprocess.run(disk_cmd, shell=True, capture_output=True, text=True)
-            disk_usage = result.stdout.strip()
-            logger.info(f"Disk usage: {disk_usage}")
+            result = subprocess.run(["df", "-h", "/"], capture_output=True, text=True)
+            disk_usage = result.stdout.splitlines()[-1].split()[4]
+            logger.info("Disk usage: %s", disk_usage)
             if disk_usage and int(disk_usage.rstrip('%')) > 90:
-                logger.warning(f"❌ Disk usage critical: {disk_usage}")
+                logger.warning("❌ Disk usage critical: %s", disk_usage)
             else:
-                logger.info(f"✅ Disk usage OK: {disk_usage}")
+                logger.info("✅ Disk usage OK: %s", disk_usage)
         except Exception as e:
-            logger.error(f"Could not check disk usage: {e}")
+            logger.error("Could not check disk usage: %s", e)
             
         return True
     except Exception as e:
-        logger.error(f"❌ Error checking system resources: {e}")
+        logger.error("❌ Error checking system resources: %s", e)
         return False
 
 def check_backend_services():
@@ -217,8 +256,8 @@ def check_frontend_services():
 
 def check_all_services():
     """Check all services."""
-    logger.info(f"\n{'='*20} LMS Service Health Check {'='*20}")
-    logger.info(f"Running health check at {datetime.now()}\n")
+    logger.info("\n%s LMS Service Health Check %s", "=" * 20, "=" * 20)
+    logger.info("Running health check at %s\n", datetime.now())
     
     results = {}
     
@@ -241,9 +280,9 @@ def check_all_services():
     
     for name, result in results.items():
         status = "✅ ONLINE" if result else "❌ OFFLINE"
-        logger.info(f"{status} - {name}")
+        logger.info("%s - %s", status, name)
     
-    logger.info(f"\n{success_count}/{len(results)} services are online.")
+    logger.info("\n%s/%s services are online.", success_count, len(results))
     
     if success_count == len(results):
         logger.info("\n🎉 All services are running properly!")
@@ -253,6 +292,7 @@ def check_all_services():
         return False
 
 if __name__ == "__main__":
+    _configure_logging()
     success = check_all_services()
     
     if not success:
@@ -18,8 +18,12 @@ Last Modified: 2025-03-19
 
 #!/usr/bin/env python3
 
+import atexit
 import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import sys
+from collections import Counter
 
 # Database connection parameters
 params = {
@@ -29,13 +33,25 @@ params = {
     'password': 'lms_password'
 }
 
+# Shared connection pool, created on first use so repeated calls reuse connections
+_POOL = None
+
+def _get_pool():
+    """Return the module's connection pool, creating it on first use."""
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadedConnectionPool(1, 4, **params)
+        # Close the pooled connections when the interpreter exits
+        atexit.register(_POOL.closeall)
+    return _POOL
+
 def update_grading_info():
     """Update the grading information for all exercise types in the database."""
     conn = None
     try:
-        # Connect to the database
+        # Get a connection to the database
         print('Connecting to the PostgreSQL database...')
-        conn = psycopg2.connect(**params)
+        conn = _get_pool().getconn()
         
         # Create a cursor
         cur = conn.cursor()
@@ -74,20 +90,31 @@ def update_grading_info():
             }
         ]
         
-        # Execute updates
-        for update in updates:
-            cur.execute(
+        # Apply all updates in one round trip by joining against a VALUES list.
+        # The connection context commits on success and rolls back on error.
+        with conn:
+            updated_rows = execute_values(
+                cur,
                 """
-                UPDATE exercises
-                SET max_score = %s, grading_type = %s
-                WHERE exercise_type = %s
+                UPDATE exercises AS e
+                SET max_score = v.max_score, grading_type = v.grading_type
+                FROM (VALUES %s) AS v (exercise_type, max_score, grading_type)
+                WHERE e.exercise_type = v.exercise_type
+                RETURNING e.exercise_type
                 """,
-                (update['max_score'], update['grading_type'], update['exercise_type'])
+                [(update['exercise_type'], update['max_score'], update['grading_type']) for update in updates],
+                page_size=len(updates),
+                fetch=True
             )
-            row_count = cur.rowcount
-            print(f"Updated {row_count} {update['exercise_type']} exercises: max_score={update['max_score']}, grading_type={update['grading_type']}")
+        row_counts = Counter(row[0] for row in updated_rows)
+        for update in updates:
+            print(f"Updated {row_counts[update['exercise_type']]} {update['exercise_type']} exercises: max_score={update['max_score']}, grading_type={update['grading_type']}")
+        print("All updates committed successfully!")
         
-        # Add default values to the database schema
+        # Add default values to the database schema. This runs after the updates
+        # have committed, in autocommit mode, so the ALTER TABLE's exclusive lock
+        # is only held for the DDL itself.
+        conn.set_session(autocommit=True)
         try:
             cur.execute("""
                 ALTER TABLE exercises 
@@ -97,10 +124,8 @@ def update_grading_info():
             print("Added default values to the database schema: max_score=1, grading_type='auto'")
         except Exception as e:
             print(f"Warning: Could not add default values to the schema: {e}")
-        
-        # Commit the transaction
-        conn.commit()
-        print("All updates committed successfully!")
+        finally:
+            conn.set_session(autocommit=False)
         
         # Close the cursor
         cur.close()
@@ -112,8 +137,8 @@ def update_grading_info():
         sys.exit(1)
     finally:
         if conn is not None:
-            conn.close()
-            print('\nDatabase connection closed.')
+            _get_pool().putconn(conn)
+            print('\nDatabase connection returned to the pool.')
 
 if __name__ == '__main__':
     update_grading_info() 
\ No newline at end of file
@@ -2,228 +2,185 @@
 """
 API tests for the LMS system.
 This tests the REST API endpoints.
+
+The application is imported and started once per session by the api_client
+fixture in conftest.py, which skips these tests if FastAPI imports fail.
 """
 
 import pytest
+import asyncio
 import sys
 import os
 from pathlib import Path
 import json
-import random
+import uuid
 from datetime import datetime
 
-# Try to import FastAPI testing components
-try:
-    from fastapi.testclient import TestClient
-    from backend.app.main import app
-    import backend.app.models as models
-    import backend.app.database as database
-    pytest_skip_api = False
-except ImportError as e:
-    print(f"Warning: FastAPI imports failed: {e}")
-    print("API tests will be skipped")
-    pytest_skip_api = True
-
-# Skip all API tests if imports failed
-pytestmark = pytest.mark.skipif(pytest_skip_api, reason="FastAPI imports failed")
-
-# Test client
-client = None if pytest_skip_api else TestClient(app)
-
-# Test data
-test_user_data = {
-    "username": f"test_user_{random.randint(1000, 9999)}",
-    "email": "test_api@example.com",
-    "password": "securepassword123",
-    "user_type": "student"
-}
-
-test_course_data = {
-    "title": f"API Test Course {random.randint(1000, 9999)}",
-    "description": "This is a course created through the API"
-}
-
-# Setup and teardown
-@pytest.fixture(scope="module")
-def auth_headers():
-    """Create a test user and get authentication headers."""
-    if pytest_skip_api:
-        return {}
-    
-    # Register a test user
-    response = client.post("/api/auth/register", json=test_user_data)
-    assert response.status_code == 201
-    
-    # Login to get token
-    login_data = {
-        "username": test_user_data["username"],
-        "password": test_user_data["password"]
-    }
-    response = client.post("/api/auth/login", data=login_data)
-    assert response.status_code == 200
-    token = response.json()["access_token"]
-    
-    # Return headers with token
-    return {"Authorization": f"Bearer {token}"}
-
-@pytest.fixture(scope="module")
-def test_course(auth_headers):
-    """Create a test course."""
-    if pytest_skip_api:
-        return None
-    
-    # Create a course
-    response = client.post("/api/courses/", json=test_course_data, headers=auth_headers)
-    assert response.status_code == 201
-    course_id = response.json()["id"]
-    
-    # Return the course ID
-    yield course_id
-    
-    # Clean up
-    client.delete(f"/api/courses/{course_id}", headers=auth_headers)
-
 # Tests
 @pytest.mark.api
-def test_health_endpoint():
+def test_health_endpoint(api_client):
     """Test the health check endpoint."""
-    if pytest_skip_api:
-        pytest.skip("FastAPI imports failed")
-    
-    response = client.get("/health")
+    response = api_client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
 
 @pytest.mark.api
-def test_auth_endpoints():
+def test_auth_endpoints(api_client, seeded_test_user):
     """Test authentication endpoints."""
-    if pytest_skip_api:
-        pytest.skip("FastAPI imports failed")
-    
     # Test login with valid credentials
     login_data = {
-        "username": test_user_data["username"],
-        "password": test_user_data["password"]
+        "username": seeded_test_user["username"],
+        "password": seeded_test_user["password"]
     }
-    response = client.post("/api/auth/login", data=login_data)
+    response = api_client.post("/api/auth/login", data=login_data)
     assert response.status_code == 200
     assert "access_token" in response.json()
     
     # Test login with invalid credentials
     invalid_login = {
-        "username": test_user_data["username"],
+        "username": seeded_test_user["username"],
         "password": "wrongpassword"
     }
-    response = client.post("/api/auth/login", data=invalid_login)
+    response = api_client.post("/api/auth/login", data=invalid_login)
     assert response.status_code == 401
 
 @pytest.mark.api
-def test_course_endpoints(auth_headers):
+def test_register_endpoint(api_client, db_pool):
+    """Test registering a new user and logging in as them."""
+    suffix = uuid.uuid4().hex[:12]
+    user_data = {
+        "username": f"test_user_{suffix}",
+        "email": f"test_user_{suffix}@example.com",
+        "password": "securepassword123",
+        "user_type": "student"
+    }
+    try:
+        response = api_client.post("/api/auth/register", json=user_data)
+        assert response.status_code == 201
+        
+        # The new user can log in
+        login_data = {
+            "username": user_data["username"],
+            "password": user_data["password"]
+        }
+        response = api_client.post("/api/auth/login", data=login_data)
+        assert response.status_code == 200
+        assert "access_token" in response.json()
+    finally:
+        # Registration commits through the app, so remove the user directly
+        conn = db_pool.getconn()
+        try:
+            with conn, conn.cursor() as cursor:
+                cursor.execute("DELETE FROM users WHERE username = %s", (user_data["username"],))
+        finally:
+            db_pool.putconn(conn)
+
+@pytest.mark.api
+def test_course_endpoints(api_client, auth_headers, make_course):
     """Test course-related endpoints."""
-    if pytest_skip_api:
-        pytest.skip("FastAPI imports failed")
-    
     # Create a new course
-    response = client.post("/api/courses/", json=test_course_data, headers=auth_headers)
+    course_data = make_course()
+    response = api_client.post("/api/courses/", json=course_data, headers=auth_headers)
     assert response.status_code == 201
     course_id = response.json()["id"]
     
     # Get course details
-    response = client.get(f"/api/courses/{course_id}")
+    response = api_client.get(f"/api/courses/{course_id}")
     assert response.status_code == 200
-    assert response.json()["title"] == test_course_data["title"]
+    assert response.json()["title"] == course_data["title"]
     
     # Update course
     update_data = {
-        "title": f"Updated Course {random.randint(1000, 9999)}",
+        "title": f"Updated Course {uuid.uuid4().hex[:12]}",
         "description": "This course has been updated"
     }
-    response = client.put(f"/api/courses/{course_id}", json=update_data, headers=auth_headers)
+    response = api_client.put(f"/api/courses/{course_id}", json=update_data, headers=auth_headers)
     assert response.status_code == 200
     
     # Verify update
-    response = client.get(f"/api/courses/{course_id}")
+    response = api_client.get(f"/api/courses/{course_id}")
     assert response.status_code == 200
     assert response.json()["title"] == update_data["title"]
     
     # Get all courses
-    response = client.get("/api/courses/")
+    response = api_client.get("/api/courses/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
     
     # Delete course
-    response = client.delete(f"/api/courses/{course_id}", headers=auth_headers)
+    response = api_client.delete(f"/api/courses/{course_id}", headers=auth_headers)
     assert response.status_code == 204
     
     # Verify deletion
-    response = client.get(f"/api/courses/{course_id}")
+    response = api_client.get(f"/api/courses/{course_id}")
     assert response.status_code == 404
 
 @pytest.mark.api
-def test_lesson_endpoints(auth_headers, test_course):
+def test_lesson_endpoints(api_client, auth_headers, test_course):
     """Test lesson-related endpoints."""
-    if pytest_skip_api:
-        pytest.skip("FastAPI imports failed")
-    
     # Create test lesson data
     lesson_data = {
-        "title": f"API Test Lesson {random.randint(1000, 9999)}",
+        "title": f"API Test Lesson {uuid.uuid4().hex[:12]}",
         "content": "This is lesson content created through the API",
         "course_id": test_course,
         "order": 1
     }
     
     # Create a new lesson
-    response = client.post("/api/lessons/", json=lesson_data, headers=auth_headers)
+    response = api_client.post("/api/lessons/", json=lesson_data, headers=auth_headers)
     assert response.status_code == 201
     lesson_id = response.json()["id"]
     
     # Get lesson details
-    response = client.get(f"/api/lessons/{lesson_id}")
+    response = api_client.get(f"/api/lessons/{lesson_id}")
     assert response.status_code == 200
     assert response.json()["title"] == lesson_data["title"]
     
     # Update lesson
     update_data = {
-        "title": f"Updated Lesson {random.randint(1000, 9999)}",
+        "title": f"Updated Lesson {uuid.uuid4().hex[:12]}",
         "content": "This lesson has been updated"
     }
-    response = client.patch(f"/api/lessons/{lesson_id}", json=update_data, headers=auth_headers)
+    response = api_client.patch(f"/api/lessons/{lesson_id}", json=update_data, headers=auth_headers)
     assert response.status_code == 200
     
     # Verify update
-    response = client.get(f"/api/lessons/{lesson_id}")
+    response = api_client.get(f"/api/lessons/{lesson_id}")
     assert response.status_code == 200
     assert response.json()["title"] == update_data["title"]
     
     # Get lessons by course
-    response = client.get(f"/api/courses/{test_course}/lessons")
+    response = api_client.get(f"/api/courses/{test_course}/lessons")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
     assert len(response.json()) >= 1
     
     # Delete lesson
-    response = client.delete(f"/api/lessons/{lesson_id}", headers=auth_headers)
+    response = api_client.delete(f"/api/lessons/{lesson_id}", headers=auth_headers)
     assert response.status_code == 204
     
     # Verify deletion
-    response = client.get(f"/api/lessons/{lesson_id}")
+    response = api_client.get(f"/api/lessons/{lesson_id}")
     assert response.status_code == 404
 
 @pytest.mark.api
-def test_exercise_and_submission_flow(auth_headers, test_course):
+@pytest.mark.asyncio
+async def test_exercise_and_submission_flow(async_api_client, auth_headers, make_course):
     """Test the complete flow of exercises and submissions."""
-    if pytest_skip_api:
-        pytest.skip("FastAPI imports failed")
+    # Create the course with the async client too, so every request in this
+    # test runs on the same event loop
+    response = await async_api_client.post("/api/courses/", json=make_course(), headers=auth_headers)
+    assert response.status_code == 201
+    course_id = response.json()["id"]
     
     # Create a lesson
     lesson_data = {
         "title": "Exercise Flow Lesson",
         "content": "This lesson tests the exercise submission flow",
-        "course_id": test_course,
+        "course_id": course_id,
         "order": 1
     }
-    response = client.post("/api/lessons/", json=lesson_data, headers=auth_headers)
+    response = await async_api_client.post("/api/lessons/", json=lesson_data, headers=auth_headers)
     assert response.status_code == 201
     lesson_id = response.json()["id"]
     
@@ -235,44 +192,48 @@ def test_exercise_and_submission_flow(auth_headers, test_course):
         "correct_answer": "Paris",
         "exercise_type": "multiple_choice"
     }
-    response = client.post("/api/exercises/", json=exercise_data, headers=auth_headers)
+    response = await async_api_client.post("/api/exercises/", json=exercise_data, headers=auth_headers)
     assert response.status_code == 201
     exercise_id = response.json()["id"]
     
     # Get exercise details
-    response = client.get(f"/api/exercises/{exercise_id}")
+    response = await async_api_client.get(f"/api/exercises/{exercise_id}")
     assert response.status_code == 200
     assert response.json()["question"] == exercise_data["question"]
     
-    # Submit correct answer
+    # Submit a correct and an incorrect answer concurrently
     submission_data = {
         "exercise_id": exercise_id,
         "answer_text": json.dumps(["Paris"])
     }
-    response = client.post("/api/submissions/", json=submission_data, headers=auth_headers)
-    assert response.status_code == 201
-    assert response.json()["is_correct"] is True
-    
-    # Submit incorrect answer
     wrong_submission = {
         "exercise_id": exercise_id,
         "answer_text": json.dumps(["London"])
     }
-    response = client.post("/api/submissions/", json=wrong_submission, headers=auth_headers)
-    assert response.status_code == 201
-    assert response.json()["is_correct"] is False
+    correct_response, wrong_response = await asyncio.gather(
+        async_api_client.post("/api/submissions/", json=submission_data, headers=auth_headers),
+        async_api_client.post("/api/submissions/", json=wrong_submission, headers=auth_headers)
+    )
+    assert correct_response.status_code == 201
+    assert correct_response.json()["is_correct"] is True
+    assert wrong_response.status_code == 201
+    assert wrong_response.json()["is_correct"] is False
     
     # Get user submissions
-    response = client.get("/api/submissions/my", headers=auth_headers)
+    response = await async_api_client.get("/api/submissions/my", headers=auth_headers)
     assert response.status_code == 200
     assert isinstance(response.json(), list)
     assert len(response.json()) >= 2
     
     # Clean up
     # Delete exercise (submissions should be deleted automatically)
-    response = client.delete(f"/api/exercises/{exercise_id}", headers=auth_headers)
+    response = await async_api_client.delete(f"/api/exercises/{exercise_id}", headers=auth_headers)
     assert response.status_code == 204
     
-    # Delete lesson
-    response = client.delete(f"/api/lessons/{lesson_id}", headers=auth_headers)
-    assert response.status_code == 204 
\ No newline at end of file
+    # Delete lesson only after its exercise is gone, since exercises.lesson_id references it
+    response = await async_api_client.delete(f"/api/lessons/{lesson_id}", headers=auth_headers)
+    assert response.status_code == 204
+    
+    # Delete the course last
+    response = await async_api_client.delete(f"/api/courses/{course_id}", headers=auth_headers)
+    assert response.status_code == 204
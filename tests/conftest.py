@@ -15,27 +15,66 @@ Usage:
     ```
 
 Fixtures:
-    - db_connection: PostgreSQL database connection
+    - db_pool: Session-wide PostgreSQL connection pool
+    - db_connection: PostgreSQL database connection checked out from the pool
     - db_cursor: Database cursor with automatic rollback
-    - async_db_session: Async SQLAlchemy session
-    - reset_sqlalchemy_db: Resets the database for SQLAlchemy tests
+    - db_dict_cursor: Database cursor returning rows as dictionaries
+    - existing_tables: Names of the tables in the public schema, looked up once
+    - sqlalchemy_schema: Creates the SQLAlchemy tables once per session
+    - async_db_session: Async SQLAlchemy session rolled back after each test
     - load_test_data: Function to load test data from fixture files
     - event_loop: Event loop for async tests
+    - api_client: FastAPI test client shared by all API tests
+    - async_api_client: Async HTTP client for concurrent API calls
+    - seeded_test_user: API test user inserted directly into the database
+    - make_course: Factory for unique course data for the API
+    - auth_headers: Authentication headers for the seeded test user
+    - test_course: ID of a course created through the API
 """
 
 import pytest
 import os
 import sys
 import asyncio
+import copy
+import functools
 from pathlib import Path
 import json
+import uuid
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+# uvloop is optional (it is not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Add parent directory to path to allow importing from the project root
 project_root = Path(__file__).parents[1]
 sys.path.insert(0, str(project_root))
 
+# Database connection parameters
+DB_PARAMS = {
+    'host': os.environ.get('DB_HOST', 'localhost'),
+    'dbname': os.environ.get('DB_NAME', 'lms_db'),
+    'user': os.environ.get('DB_USER', 'lms_user'),
+    'password': os.environ.get('DB_PASSWORD', 'lms_password'),
+    'port': os.environ.get('DB_PORT', '5432')
+}
+
+# pytest-xdist worker running this process, if any. Each worker runs against
+# its own copy of the test database, cloned from it before the workers start.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+XDIST_WORKER_COUNT = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+TEMPLATE_DB_NAME = DB_PARAMS['dbname']
+if XDIST_WORKER:
+    DB_PARAMS['dbname'] = f"{TEMPLATE_DB_NAME}_{XDIST_WORKER}"
+    # Must be set before the backend settings are imported below
+    os.environ['LMS_DB_NAME'] = DB_PARAMS['dbname']
+
 # Try to import relevant modules
 try:
     from backend.app.database import engine as app_engine
@@ -46,18 +85,17 @@ except ImportError as e:
     print(f"Warning: Some imports failed: {e}")
     print("Some tests may not run correctly.")
 
-# Database connection parameters
-DB_PARAMS = {
-    'host': os.environ.get('DB_HOST', 'localhost'),
-    'dbname': os.environ.get('DB_NAME', 'lms_db'),
-    'user': os.environ.get('DB_USER', 'lms_user'),
-    'password': os.environ.get('DB_PASSWORD', 'lms_password'),
-    'port': os.environ.get('DB_PORT', '5432')
-}
+# Use uvloop's faster event loop for async tests when it is installed
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 # Test data paths
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
+# Password of the seeded API test user and its precomputed bcrypt hash (cost 12)
+TEST_USER_PASSWORD = "securepassword123"
+TEST_USER_PASSWORD_HASH = "$2b$12$A.H9vWi9aRozeIXyLO/jreAnt4qRzimhcVgjlFJH8WvBGHuykbO8O"
+
 # Pytest configuration
 def pytest_configure(config):
     """
@@ -81,12 +119,39 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "sqlalchemy: mark a test as using SQLAlchemy")
     config.addinivalue_line("markers", "asyncio: mark a test as asyncio test")
 
+def pytest_sessionstart(session):
+    """
+    Clone the test database for each pytest-xdist worker.
+    
+    This runs in the xdist controller before any worker starts. Cloning with
+    CREATE DATABASE ... TEMPLATE copies the migrated schema in one step, so
+    workers never run migrations or create_all against a shared database.
+    Nothing else may be connected to the test database while it is cloned.
+    """
+    workers = getattr(session.config.option, "numprocesses", None)
+    if not workers or hasattr(session.config, "workerinput"):
+        return
+    
+    conn = psycopg2.connect(**{**DB_PARAMS, 'dbname': 'postgres'})
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            for i in range(workers):
+                worker_db = sql.Identifier(f"{TEMPLATE_DB_NAME}_gw{i}")
+                cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(worker_db))
+                cursor.execute(
+                    sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(worker_db, sql.Identifier(TEMPLATE_DB_NAME))
+                )
+    finally:
+        conn.close()
+
 @pytest.fixture(scope="session")
 def event_loop():
     """
     Create an instance of the default event loop for each test session.
     
-    This fixture provides a consistent event loop for async tests.
+    This fixture provides a consistent event loop for async tests, using
+    uvloop when it is installed.
     
     Returns:
         asyncio.EventLoop: Event loop for async tests
@@ -94,30 +159,64 @@ def event_loop():
     Yields:
         asyncio.EventLoop: Event loop that is automatically closed after tests
     """
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    if uvloop is not None:
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.get_event_loop_policy().new_event_loop()
     yield loop
     loop.close()
 
+@pytest.fixture(scope="session")
+def db_pool():
+    """
+    Create a database connection pool for the test session.
+    
+    This fixture opens connections using the parameters defined in DB_PARAMS
+    once per session, so tests check out a warm connection instead of paying
+    the connect and authentication cost every time.
+    
+    Under pytest-xdist every worker has its own pool, sized so the workers
+    together stay within the same connection budget.
+    
+    Returns:
+        psycopg2.pool.ThreadedConnectionPool: Connection pool
+        
+    Yields:
+        psycopg2.pool.ThreadedConnectionPool: Pool that is closed after the session
+    """
+    pool = ThreadedConnectionPool(
+        minconn=1,
+        maxconn=max(2, 8 // XDIST_WORKER_COUNT),
+        **DB_PARAMS
+    )
+    
+    yield pool
+    pool.closeall()
+
 @pytest.fixture(scope="function")
-def db_connection():
+def db_connection(db_pool):
     """
     Create a database connection for testing.
     
-    This fixture establishes a connection to the PostgreSQL database using
-    the connection parameters defined in DB_PARAMS.
+    This fixture checks a connection out of the session pool and returns it
+    after the test, rolling back anything the test left uncommitted.
     
+    Args:
+        db_pool: Database connection pool fixture
+        
     Returns:
         psycopg2.connection: Database connection object
         
     Yields:
-        psycopg2.connection: Connection that is automatically closed after tests
+        psycopg2.connection: Connection that is automatically returned to the pool after tests
     """
+    conn = db_pool.getconn()
     try:
-        conn = psycopg2.connect(**DB_PARAMS, cursor_factory=RealDictCursor)
         conn.autocommit = False
         yield conn
     finally:
-        conn.close()
+        conn.rollback()
+        db_pool.putconn(conn)
 
 @pytest.fixture(scope="function")
 def db_cursor(db_connection):
@@ -142,41 +241,96 @@ def db_cursor(db_connection):
     cursor.close()
 
 @pytest.fixture(scope="function")
-async def async_db_session():
+def db_dict_cursor(db_connection):
     """
-    Create an async database session for testing.
+    Create a database cursor that returns rows as dictionaries.
     
-    This fixture provides an async SQLAlchemy session that is automatically
-    rolled back after the test to avoid any test data persistence.
+    Connections hand out plain tuple cursors; use this fixture only in tests
+    that read columns by name, since building a dict per row costs extra.
     
+    Args:
+        db_connection: Database connection fixture
+        
     Returns:
-        AsyncSession: Async SQLAlchemy session
+        psycopg2.extras.RealDictCursor: Database cursor
         
     Yields:
-        AsyncSession: Session that is automatically rolled back after tests
+        psycopg2.extras.RealDictCursor: Cursor that is automatically rolled back and closed after tests
     """
-    async with AsyncSessionLocal() as session:
-        yield session
-        await session.rollback()
+    cursor = db_connection.cursor(cursor_factory=RealDictCursor)
+    yield cursor
+    db_connection.rollback()
+    cursor.close()
 
-@pytest.fixture(scope="function")
-async def reset_sqlalchemy_db():
+@pytest.fixture(scope="session")
+def existing_tables(db_pool):
     """
-    Reset the database for SQLAlchemy tests.
+    Look up the tables in the public schema once for the test session.
     
-    This fixture drops and recreates all tables before and after each test,
-    ensuring a clean database state for each test.
+    Direct database tests check this set to decide whether to skip, instead
+    of each querying information_schema on its own.
+    
+    Args:
+        db_pool: Database connection pool fixture
+        
+    Returns:
+        frozenset: Names of the tables in the public schema
+    """
+    conn = db_pool.getconn()
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT table_name 
+                FROM information_schema.tables 
+                WHERE table_schema = 'public'
+            """)
+            return frozenset(row[0] for row in cursor.fetchall())
+    finally:
+        db_pool.putconn(conn)
+
+@pytest.fixture(scope="session")
+async def sqlalchemy_schema():
+    """
+    Create the SQLAlchemy model tables once for the test session.
     
     Yields:
         None
     """
     async with app_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     yield
-    async with app_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
+
+@pytest.fixture(scope="function")
+async def async_db_session(sqlalchemy_schema):
+    """
+    Create an async database session for testing.
+    
+    The session is bound to a connection whose outer transaction is always
+    rolled back after the test. Commits made by the test only release a
+    SAVEPOINT, so each test sees a clean database without any DDL.
+    
+    Args:
+        sqlalchemy_schema: Schema creation fixture
+        
+    Returns:
+        AsyncSession: Async SQLAlchemy session
+        
+    Yields:
+        AsyncSession: Session whose changes are rolled back after tests
+    """
+    async with app_engine.connect() as conn:
+        transaction = await conn.begin()
+        async with AsyncSessionLocal(bind=conn, join_transaction_mode="create_savepoint") as session:
+            yield session
+        await transaction.rollback()
+
+@functools.lru_cache(maxsize=None)
+def _read_fixture(filename):
+    """Read and parse a fixture file once per session; None if it doesn't exist."""
+    file_path = FIXTURES_DIR / filename
+    if not file_path.exists():
+        return None
+    return json.loads(file_path.read_text())
 
 @pytest.fixture(scope="function")
 def load_test_data():
@@ -184,7 +338,8 @@ def load_test_data():
     Load test data from fixtures.
     
     This fixture provides a function to load test data from JSON files
-    in the fixtures directory.
+    in the fixtures directory. Each file is read and parsed only once per
+    session; callers receive a fresh copy of the parsed data.
     
     Returns:
         callable: Function that loads test data from a file
@@ -197,9 +352,170 @@ def load_test_data():
         ```
     """
     def _load_data(filename):
-        file_path = FIXTURES_DIR / filename
-        if not file_path.exists():
-            return None
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    return _load_data 
\ No newline at end of file
+        data = _read_fixture(filename)
+        # Hand out a copy so tests can't mutate the cached data
+        return copy.deepcopy(data) if data is not None else None
+    return _load_data
+
+@pytest.fixture(scope="session")
+def api_client():
+    """
+    Create a FastAPI test client for the test session.
+    
+    The client's context is entered once so the application's startup and
+    shutdown handlers run a single time for all API tests.
+    
+    Yields:
+        TestClient: Test client bound to the LMS application
+    """
+    try:
+        from fastapi.testclient import TestClient
+        from backend.app.main import app
+    except ImportError as e:
+        pytest.skip(f"FastAPI imports failed: {e}")
+    
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+async def async_api_client():
+    """
+    Create an async HTTP client for the test session.
+    
+    Requests are dispatched straight to the ASGI application, so independent
+    API calls can be awaited concurrently with asyncio.gather. Tests using this
+    client should create their data through it rather than through api_client
+    fixtures, which run on a different event loop.
+    
+    Yields:
+        httpx.AsyncClient: Async client bound to the LMS application
+    """
+    try:
+        import httpx
+        from backend.app.main import app
+        from backend.app.database import engine as app_engine
+    except ImportError as e:
+        pytest.skip(f"Async API client imports failed: {e}")
+    
+    # api_client runs the app on the TestClient's own event loop. Drop any pooled
+    # asyncpg connections opened there without closing them, since they can't be
+    # used from this loop, and close the ones opened here before api_client
+    # gets the engine back.
+    await app_engine.dispose(close=False)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    await app_engine.dispose()
+
+@pytest.fixture(scope="session")
+def seeded_test_user(db_pool):
+    """
+    Seed a well-known API test user directly into the database.
+    
+    The stored hash is precomputed for TEST_USER_PASSWORD, so no bcrypt work
+    or registration request is needed. The row is upserted on its email, which
+    lets every session reuse the same user, including a row that older runs
+    registered with this email under a random username.
+    
+    Args:
+        db_pool: Database connection pool fixture
+        
+    Returns:
+        dict: ID, username, email and plain-text password of the test user
+    """
+    user = {
+        "username": "api_test_user",
+        "email": "test_api@example.com",
+        "password": TEST_USER_PASSWORD
+    }
+    conn = db_pool.getconn()
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO users (username, email, hashed_password, role, is_active)
+                VALUES (%s, %s, %s, 'student', TRUE)
+                ON CONFLICT (email) DO UPDATE
+                SET username = EXCLUDED.username,
+                    hashed_password = EXCLUDED.hashed_password,
+                    is_active = TRUE
+                RETURNING id
+                """,
+                (user["username"], user["email"], TEST_USER_PASSWORD_HASH)
+            )
+            user["id"] = cursor.fetchone()[0]
+    finally:
+        db_pool.putconn(conn)
+    return user
+
+@pytest.fixture(scope="session")
+def make_course():
+    """
+    Factory for course data used with the API.
+    
+    Each call returns data with a unique title, so tests don't collide with
+    each other or with parallel test runs.
+    
+    Returns:
+        callable: Function returning a new course creation dict
+    """
+    def _make_course():
+        return {
+            "title": f"API Test Course {uuid.uuid4().hex[:12]}",
+            "description": "This is a course created through the API"
+        }
+    return _make_course
+
+@pytest.fixture(scope="session")
+def auth_headers(seeded_test_user):
+    """
+    Get authentication headers for the seeded test user.
+    
+    The token is signed directly with the application's token helper, the
+    same way the login endpoint does, so no login request or password check
+    is needed. The login endpoint itself is covered by test_auth_endpoints.
+    
+    Args:
+        seeded_test_user: Seeded test user fixture
+        
+    Returns:
+        dict: Authorization headers with a bearer token
+    """
+    try:
+        from backend.app.services.auth import create_access_token
+    except ImportError as e:
+        pytest.skip(f"Auth service imports failed: {e}")
+    
+    token = create_access_token(
+        data={
+            "sub": str(seeded_test_user["id"]),
+            "username": seeded_test_user["username"],
+            "role": "student"
+        }
+    )
+    
+    # Return headers with token
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture(scope="session")
+def test_course(api_client, auth_headers, make_course):
+    """
+    Create a test course through the API.
+    
+    Args:
+        api_client: FastAPI test client fixture
+        auth_headers: Authentication headers fixture
+        make_course: Course data factory fixture
+        
+    Yields:
+        int: ID of the course, which is deleted after the session
+    """
+    # Create a course
+    response = api_client.post("/api/courses/", json=make_course(), headers=auth_headers)
+    assert response.status_code == 201
+    course_id = response.json()["id"]
+    
+    # Return the course ID
+    yield course_id
+    
+    # Clean up
+    api_client.delete(f"/api/courses/{course_id}", headers=auth_headers)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Fixtures shared by the integration tests.
+
+The course scaffolding that several SQLAlchemy workflow tests need is built
+once per module inside a transaction that is never committed. Each test then
+runs in a SAVEPOINT on that same connection, so its writes are rolled back
+while the scaffolding stays in place for the next test.
+
+Fixtures:
+    - sample_course: Course with lessons and exercises, created once per module
+    - sample_course_session: Async SQLAlchemy session that sees sample_course
+"""
+
+import pytest
+import random
+from types import SimpleNamespace
+
+try:
+    from sqlalchemy import insert
+    from backend.app.database import engine as app_engine
+    from backend.app.database import AsyncSessionLocal
+    from backend.app.models import Course, Lesson, Exercise
+except ImportError as e:
+    print(f"Warning: SQLAlchemy imports failed: {e}")
+    print("Integration course fixtures will not be available")
+
+# Shape of the sample course
+SAMPLE_LESSONS = 3
+SAMPLE_EXERCISES_PER_LESSON = 2
+
+@pytest.fixture(scope="module")
+async def sample_course(sqlalchemy_schema):
+    """
+    Create a course with lessons and exercises once per test module.
+
+    The rows are inserted in a transaction that is rolled back when the
+    module finishes, so nothing is left behind in the database.
+
+    Args:
+        sqlalchemy_schema: Schema creation fixture
+
+    Returns:
+        SimpleNamespace: connection, course_id, lesson_ids and exercise_ids
+
+    Yields:
+        SimpleNamespace: Sample course that is rolled back after the module
+    """
+    async with app_engine.connect() as conn:
+        transaction = await conn.begin()
+
+        result = await conn.execute(
+            insert(Course).returning(Course.id),
+            {
+                "title": f"Sample Course {random.randint(1000, 9999)}",
+                "description": "Shared course for integration tests"
+            }
+        )
+        course_id = result.scalar_one()
+
+        result = await conn.execute(
+            insert(Lesson).returning(Lesson.id),
+            [
+                {
+                    "title": f"Lesson {i+1}",
+                    "content": f"Content for lesson {i+1}",
+                    "course_id": course_id,
+                    "order": i+1
+                }
+                for i in range(SAMPLE_LESSONS)
+            ]
+        )
+        lesson_ids = result.scalars().all()
+
+        answer_options = ["A", "B", "C", "D"]
+        result = await conn.execute(
+            insert(Exercise).returning(Exercise.id),
+            [
+                {
+                    "lesson_id": lesson_id,
+                    "question": f"Question {i+1} for lesson {lesson_id}?",
+                    "answer_options": answer_options,
+                    "correct_answer": "A",
+                    "exercise_type": "multiple_choice"
+                }
+                for lesson_id in lesson_ids
+                for i in range(SAMPLE_EXERCISES_PER_LESSON)
+            ]
+        )
+        exercise_ids = result.scalars().all()
+
+        yield SimpleNamespace(
+            connection=conn,
+            course_id=course_id,
+            lesson_ids=lesson_ids,
+            exercise_ids=exercise_ids
+        )
+        await transaction.rollback()
+
+@pytest.fixture(scope="function")
+async def sample_course_session(sample_course):
+    """
+    Create an async session on the sample course's connection.
+
+    Everything the test writes, including what it commits, is rolled back
+    to a SAVEPOINT taken before the test.
+
+    Args:
+        sample_course: Module-scoped sample course fixture
+
+    Returns:
+        AsyncSession: Async SQLAlchemy session
+
+    Yields:
+        AsyncSession: Session whose changes are rolled back after tests
+    """
+    savepoint = await sample_course.connection.begin_nested()
+    async with AsyncSessionLocal(
+        bind=sample_course.connection, join_transaction_mode="create_savepoint"
+    ) as session:
+        yield session
+    await savepoint.rollback()
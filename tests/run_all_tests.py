@@ -12,10 +12,12 @@ Options:
     --api            Run only API tests
     --all            Run all tests (default)
     --coverage       Generate test coverage report
+    --parallel       Run test files in parallel with pytest-xdist
     
 Dependencies:
     - pytest
     - pytest-cov
+    - pytest-xdist (for --parallel)
     
 Output:
     Test results and optional coverage report
@@ -25,11 +27,13 @@ Last Modified: 2025-03-20
 """
 
 import argparse
-import subprocess
 import sys
-import os
 from pathlib import Path
 
+import pytest
+
+PROJECT_ROOT = Path(__file__).parents[1]
+
 def parse_args():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Run LMS tests")
@@ -38,32 +42,38 @@ def parse_args():
     parser.add_argument("--api", action="store_true", help="Run only API tests")
     parser.add_argument("--all", action="store_true", help="Run all tests (default)")
     parser.add_argument("--coverage", action="store_true", help="Generate test coverage report")
+    parser.add_argument("--parallel", action="store_true", help="Run test files in parallel with pytest-xdist")
     return parser.parse_args()
 
-def run_tests(test_type=None, coverage=False):
-    """Run tests with pytest."""
-    # Change to the project root directory
-    os.chdir(Path(__file__).parents[1])
-    
-    cmd = ["python", "-m", "pytest"]
+def run_tests(test_type=None, coverage=False, parallel=False):
+    """Run tests with pytest in this interpreter."""
+    # Paths are absolute so the run doesn't depend on the current directory
+    args = [
+        "-c", str(PROJECT_ROOT / "pytest.ini"),
+        "--rootdir", str(PROJECT_ROOT),
+        str(PROJECT_ROOT / "tests")
+    ]
     
     # Add coverage if requested
     if coverage:
-        cmd.extend([
-            "--cov=backend", 
-            "--cov=database", 
+        args.extend([
+            f"--cov={PROJECT_ROOT / 'backend'}", 
+            f"--cov={PROJECT_ROOT / 'database'}", 
             "--cov-report=term", 
-            "--cov-report=html:tests/coverage_html"
+            f"--cov-report=html:{PROJECT_ROOT / 'tests' / 'coverage_html'}"
         ])
     
+    # Spread test files across one worker per CPU core
+    if parallel:
+        args.extend(["-n", "auto", "--dist", "loadfile"])
+    
     # Add test type marker if specified
     if test_type:
-        cmd.append(f"-m {test_type}")
+        args.extend(["-m", test_type])
     
-    # Run the command
-    print(f"Running command: {' '.join(cmd)}")
-    result = subprocess.run(cmd)
-    return result.returncode
+    # Run pytest
+    print(f"Running pytest {' '.join(args)}")
+    return int(pytest.main(args))
 
 def main():
     """Main function."""
@@ -71,13 +81,13 @@ def main():
     
     # Determine which tests to run
     if args.unit:
-        return run_tests("unit", args.coverage)
+        return run_tests("unit", args.coverage, args.parallel)
     elif args.integration:
-        return run_tests("integration", args.coverage)
+        return run_tests("integration", args.coverage, args.parallel)
     elif args.api:
-        return run_tests("api", args.coverage)
+        return run_tests("api", args.coverage, args.parallel)
     else:  # Run all tests by default
-        return run_tests(None, args.coverage)
+        return run_tests(None, args.coverage, args.parallel)
 
 if __name__ == "__main__":
     sys.exit(main()) 
\ No newline at end of file
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the mock objects in tests/utils/mock_objects.py.
+
+The mock database keeps an index of column values, so these tests check that
+queries stay correct as records are inserted, changed and removed.
+"""
+
+import pytest
+from datetime import datetime
+
+from tests.utils.mock_objects import (
+    MockDatabase, MockSession, MockUser, MockCourse, MockCourseTable, MockAPIClient,
+    MockExercise
+)
+
+
+class User(MockUser):
+    """Mock user whose class name maps to the "users" table."""
+    __slots__ = ()
+
+
+class Course:
+    """Minimal model built from "courses" records by MockSession.query."""
+
+    def __init__(self, **fields):
+        self.id = fields["id"]
+        self.title = fields["title"]
+
+
+@pytest.fixture
+def mock_db():
+    """Mock database with three courses."""
+    db = MockDatabase()
+    db.insert_many("courses", [
+        {"title": "Python", "creator_id": 1, "tags": ["code"]},
+        {"title": "SQL", "creator_id": 1, "tags": ["data"]},
+        {"title": "Art", "creator_id": 2, "tags": ["code"]}
+    ])
+    return db
+
+@pytest.mark.unit
+def test_mock_database_query_after_update_and_delete(mock_db):
+    """Test that queries follow updates and deletes."""
+    assert [c["id"] for c in mock_db.query("courses", creator_id=1)] == [1, 2]
+
+    mock_db.update("courses", 2, {"creator_id": 2})
+    assert [c["id"] for c in mock_db.query("courses", creator_id=1)] == [1]
+    assert [c["id"] for c in mock_db.query("courses", creator_id=2)] == [2, 3]
+
+    mock_db.delete("courses", 3)
+    assert [c["id"] for c in mock_db.query("courses", creator_id=2)] == [2]
+    assert mock_db.query("courses", title="Art") == []
+
+@pytest.mark.unit
+def test_mock_database_query_unhashable_value(mock_db):
+    """Test filtering on list values, which the index can't hold."""
+    results = mock_db.query("courses", tags=["code"])
+    assert [c["id"] for c in results] == [1, 3]
+
+    results = mock_db.query("courses", tags=["code"], creator_id=2)
+    assert [c["id"] for c in results] == [3]
+
+@pytest.mark.unit
+def test_mock_database_returns_copies(mock_db):
+    """Test that changing returned records doesn't affect stored data."""
+    course = mock_db.get("courses", 1)
+    course["creator_id"] = 99
+    mock_db.query("courses", creator_id=1)[0]["title"] = "Changed"
+
+    assert mock_db.get("courses", 1)["creator_id"] == 1
+    assert mock_db.get("courses", 1)["title"] == "Python"
+    assert mock_db.query("courses", creator_id=99) == []
+
+@pytest.mark.unit
+def test_mock_database_snapshot_restore(mock_db):
+    """Test that restore() brings back records, index and IDs."""
+    snapshot = mock_db.snapshot()
+
+    mock_db.update("courses", 1, {"title": "Changed"})
+    mock_db.delete("courses", 2)
+    assert mock_db.insert("courses", {"title": "New"}) == 4
+
+    for _ in range(2):
+        mock_db.restore(snapshot)
+        assert [c["title"] for c in mock_db.query("courses", creator_id=1)] == ["Python", "SQL"]
+        assert mock_db.query("courses", title="New") == []
+        assert mock_db.insert("courses", {"title": "New"}) == 4
+
+@pytest.mark.unit
+def test_mock_session_add_all_and_query(mock_db):
+    """Test batch adds and the fake query object."""
+    session = MockSession()
+    users = [User(username="ann"), User(username="bob")]
+    session.add_all(users)
+    assert [user.id for user in users] == [1, 2]
+    assert session.mock_database.get("users", 2)["username"] == "bob"
+
+    session.mock_database = mock_db
+    query = session.query(Course)
+    assert [course.title for course in query.all()] == ["Python", "SQL", "Art"]
+    assert query.first().title == "Python"
+    assert query.get(3).title == "Art"
+    assert query.get(42) is None
+    assert query.filter_by(creator_id=2).first().id == 3
+    assert query.filter_by(creator_id=5).first() is None
+
+@pytest.mark.unit
+def test_mock_course_table_matches_mock_course():
+    """Test that the column store serializes like MockCourse."""
+    table = MockCourseTable()
+    created_at = datetime(2024, 1, 1)
+    table.append(title="Python", creator_id=7, created_at=created_at)
+    table.append(title="SQL", creator_id=8, created_at=created_at)
+
+    assert len(table) == 2
+    assert table.to_dict_all() == [table.row(i).to_dict() for i in range(len(table))]
+
+    course = table.row(1)
+    assert isinstance(course, MockCourse)
+    assert course.to_dict()["created_at"] == created_at.isoformat()
+
+@pytest.mark.unit
+def test_mock_api_client_canned_responses_unchanged():
+    """Test that changing an error response doesn't affect later ones."""
+    client = MockAPIClient()
+
+    response = client.get("/courses/42")
+    assert response.status_code == 404
+    response.json()["error"] = "Changed"
+
+    response = client.get("/courses/42")
+    assert response.json() == {"error": "Course not found"}
+    assert response.text() == '{"error": "Course not found"}'
+
+    course_id = client.mock_database.insert("courses", {"title": "Python"})
+    response = client.delete(f"/courses/{course_id}")
+    assert response.status_code == 204
+    response.json()["extra"] = True
+    assert client.delete("/courses/42").status_code == 404
+    assert client.mock_database.insert("courses", {"title": "SQL"}) == course_id + 1
+    assert client.delete(f"/courses/{course_id + 1}").json() == {}
+
+@pytest.mark.unit
+def test_mock_exercise_follows_reassigned_answers():
+    """Test that answer checks and to_dict() use the current attributes."""
+    exercise = MockExercise(answer_options=["Paris", "Rome"], correct_answer="Paris")
+    assert exercise.check_answer('["Paris"]')
+    assert exercise.to_dict()["answer_options"] == '["Paris", "Rome"]'
+
+    exercise.correct_answer = "Rome"
+    exercise.answer_options = ["Rome", "Oslo"]
+    assert not exercise.check_answer('["Paris"]')
+    assert exercise.check_answer('["Rome"]')
+    assert exercise.to_dict()["answer_options"] == '["Rome", "Oslo"]'
+
+@pytest.mark.unit
+def test_mock_exercise_unhashable_correct_answer():
+    """Test exercises whose correct answer is a list or dict."""
+    matching = MockExercise(exercise_type="matching", correct_answer={"a": 1, "b": 2})
+    assert matching.check_answer({"a": 1, "b": 2})
+    assert not matching.check_answer({"a": 2, "b": 1})
+
+    ordered = MockExercise(correct_answer=["Paris", "Rome"])
+    assert ordered.check_answer('[["Paris", "Rome"]]')
+    assert not ordered.check_answer('["Paris"]')
+
+@pytest.mark.unit
+def test_mock_api_client_routes():
+    """Test course routes, including nested paths and bad IDs."""
+    client = MockAPIClient()
+    course_id = client.mock_database.insert("courses", {"title": "Python"})
+
+    assert client.get(f"/courses/{course_id}").json()["title"] == "Python"
+    assert client.get(f"/courses/{course_id}/lessons").status_code == 200
+    assert client.put(f"/courses/{course_id}", json_data={"title": "SQL"}).json()["title"] == "SQL"
+
+    response = client.get("/courses/abc")
+    assert response.status_code == 404
+    assert response.json() == {"error": "Endpoint not found"}
+    assert client.delete("/courses/").status_code == 404
+    assert client.get("/lessons/1").status_code == 404
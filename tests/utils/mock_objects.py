@@ -4,13 +4,182 @@ Mock objects for testing the LMS system.
 These objects can be used as substitutes for real components in tests.
 """
 
+import itertools
 import json
 import random
+from collections import deque
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from unittest.mock import MagicMock
 
+# Random mock IDs are drawn in batches rather than one randint call per object
+_ID_RANGE = range(1, 1001)
+_ID_POOL_SIZE = 4096
+_id_pool = deque()
+
+def _next_id():
+    """Return a random ID between 1 and 1000 from the pre-drawn pool."""
+    if not _id_pool:
+        _id_pool.extend(random.choices(_ID_RANGE, k=_ID_POOL_SIZE))
+    return _id_pool.popleft()
+
+
+class _TableView:
+    """
+    One MockDatabase table with its storage already resolved.
+    
+    Holding a view (for example ``users = db.users``) skips the table-name
+    lookup and existence check that the MockDatabase methods do per call.
+    """
+    
+    __slots__ = ("name", "_data", "_columns", "_counter")
+    
+    def __init__(self, name, data):
+        self.name = name
+        self._data = data
+        # Inverted index: column -> value -> set of record IDs
+        self._columns = {}
+        # Next record ID
+        self._counter = itertools.count(1)
+    
+    def _index(self, record):
+        """Add a record's column values to the index."""
+        columns = self._columns
+        for key, value in record.items():
+            try:
+                columns.setdefault(key, {}).setdefault(value, set()).add(record["id"])
+            except TypeError:
+                # Unhashable values (lists, dicts) are matched by scanning instead
+                pass
+    
+    def _unindex(self, record):
+        """Remove a record's column values from the index."""
+        columns = self._columns
+        for key, value in record.items():
+            try:
+                ids = columns[key][value]
+            except (KeyError, TypeError):
+                continue
+            ids.discard(record["id"])
+            if not ids:
+                del columns[key][value]
+    
+    def insert(self, record):
+        """Insert a record."""
+        return self.insert_many([record])[0]
+    
+    def insert_many(self, records):
+        """Insert several records and return their IDs."""
+        # One timestamp for the whole batch
+        now = datetime.now().isoformat()
+        
+        data = self._data
+        counter = self._counter
+        record_ids = []
+        for record in records:
+            record_id = next(counter)
+            
+            record = record.copy()
+            record["id"] = record_id
+            
+            # Add timestamps if not present
+            record.setdefault("created_at", now)
+            record.setdefault("updated_at", now)
+            
+            data[record_id] = record
+            self._index(record)
+            record_ids.append(record_id)
+        return record_ids
+    
+    def get(self, record_id):
+        """Get a copy of a record by ID."""
+        record = self._data.get(record_id)
+        return record.copy() if record is not None else None
+    
+    def query(self, **filters):
+        """
+        Query records with filters.
+        
+        Copies are returned, so changing a result can't leave the index out
+        of date; use update() to change stored records.
+        """
+        # Intersect the ID sets of the indexed filters
+        ids = None
+        unindexed = {}
+        for key, value in filters.items():
+            try:
+                matches = self._columns.get(key, {}).get(value, set())
+            except TypeError:
+                unindexed[key] = value
+                continue
+            ids = matches if ids is None else ids & matches
+            if not ids:
+                return []
+        
+        # Only the matching records are looked up, in insertion order
+        if ids is None:
+            records = self._data.values()
+        else:
+            records = [self._data[record_id] for record_id in sorted(ids)]
+        
+        return [
+            record.copy() for record in records
+            if all(key in record and record[key] == value for key, value in unindexed.items())
+        ]
+    
+    def update(self, record_id, updates):
+        """Update a record."""
+        record = self._data.get(record_id)
+        if not record:
+            return False
+        
+        self._unindex(record)
+        for key, value in updates.items():
+            record[key] = value
+        
+        record["updated_at"] = datetime.now().isoformat()
+        self._index(record)
+        return True
+    
+    def delete(self, record_id):
+        """Delete a record."""
+        if record_id in self._data:
+            self._unindex(self._data.pop(record_id))
+            return True
+        return False
+    
+    def clear(self):
+        """Remove all records and restart IDs at 1."""
+        self._data.clear()
+        self._columns.clear()
+        self._counter = itertools.count(1)
+    
+    def snapshot(self):
+        """Capture the records and next ID."""
+        next_id = next(self._counter)
+        self._counter = itertools.count(next_id)
+        return {record_id: record.copy() for record_id, record in self._data.items()}, next_id
+    
+    def restore(self, state):
+        """Reset the table to a state returned by snapshot()."""
+        records, next_id = state
+        self.clear()
+        for record_id, record in records.items():
+            record = record.copy()
+            self._data[record_id] = record
+            self._index(record)
+        self._counter = itertools.count(next_id)
+
+
 class MockDatabase:
-    """Mock database for testing."""
+    """
+    Mock database for testing.
+    
+    Records are indexed by column value, so they must only be changed
+    through insert, update and delete. get() and query() return copies;
+    the dicts in ``data`` are the stored records and should be treated as
+    read-only.
+    """
     
     def __init__(self):
         self.data = {
@@ -20,90 +189,104 @@ class MockDatabase:
             "exercises": {},
             "submissions": {}
         }
-        self.id_counters = {table: 1 for table in self.data.keys()}
+        self.tables = {table: _TableView(table, records) for table, records in self.data.items()}
+        self.users = self.tables["users"]
+        self.courses = self.tables["courses"]
+        self.lessons = self.tables["lessons"]
+        self.exercises = self.tables["exercises"]
+        self.submissions = self.tables["submissions"]
+    
+    def _table(self, table):
+        """Return the view for a table name."""
+        try:
+            return self.tables[table]
+        except KeyError:
+            raise ValueError(f"Table {table} does not exist") from None
     
     def insert(self, table, record):
         """Insert a record into a table."""
-        if table not in self.data:
-            raise ValueError(f"Table {table} does not exist")
-        
-        record_id = self.id_counters[table]
-        self.id_counters[table] += 1
-        
-        record = record.copy()
-        record["id"] = record_id
-        
-        # Add timestamps if not present
-        now = datetime.now().isoformat()
-        if "created_at" not in record:
-            record["created_at"] = now
-        if "updated_at" not in record:
-            record["updated_at"] = now
-            
-        self.data[table][record_id] = record
-        return record_id
+        return self._table(table).insert(record)
+    
+    def insert_many(self, table, records):
+        """Insert several records into a table and return their IDs."""
+        return self._table(table).insert_many(records)
     
     def get(self, table, record_id):
         """Get a record from a table by ID."""
-        if table not in self.data:
-            raise ValueError(f"Table {table} does not exist")
-        
-        return self.data[table].get(record_id)
+        return self._table(table).get(record_id)
     
     def query(self, table, **filters):
         """Query records from a table with filters."""
-        if table not in self.data:
-            raise ValueError(f"Table {table} does not exist")
-        
-        results = []
-        for record in self.data[table].values():
-            match = True
-            for key, value in filters.items():
-                if key not in record or record[key] != value:
-                    match = False
-                    break
-            if match:
-                results.append(record)
-        
-        return results
+        return self._table(table).query(**filters)
     
     def update(self, table, record_id, updates):
         """Update a record in a table."""
-        if table not in self.data:
-            raise ValueError(f"Table {table} does not exist")
-        
-        record = self.get(table, record_id)
-        if not record:
-            return False
-        
-        for key, value in updates.items():
-            record[key] = value
-        
-        record["updated_at"] = datetime.now().isoformat()
-        return True
+        return self._table(table).update(record_id, updates)
     
     def delete(self, table, record_id):
         """Delete a record from a table."""
-        if table not in self.data:
-            raise ValueError(f"Table {table} does not exist")
-        
-        if record_id in self.data[table]:
-            del self.data[table][record_id]
-            return True
-        return False
+        return self._table(table).delete(record_id)
     
     def clear(self):
         """Clear all data from the database."""
-        for table in self.data:
-            self.data[table] = {}
-        self.id_counters = {table: 1 for table in self.data.keys()}
+        for view in self.tables.values():
+            view.clear()
+    
+    def snapshot(self):
+        """
+        Capture the contents of every table.
+        
+        Tests can load shared fixture data once, take a snapshot, and call
+        restore() between tests instead of inserting the data again.
+        """
+        return {table: view.snapshot() for table, view in self.tables.items()}
+    
+    def restore(self, snapshot):
+        """Reset every table to a snapshot; the snapshot can be restored again."""
+        for table, state in snapshot.items():
+            self.tables[table].restore(state)
+
+
+class _Timestamp:
+    """
+    Datetime attribute that caches its isoformat() string.
+    
+    The string is built the first time to_dict() needs it and dropped
+    whenever the attribute is reassigned, so repeated serialization doesn't
+    format the same datetime again.
+    """
+    
+    __slots__ = ("_value", "_iso")
+    
+    def __set_name__(self, owner, name):
+        self._value = f"_{name}"
+        self._iso = f"_{name}_iso"
+    
+    def __get__(self, obj, objtype=None):
+        return self if obj is None else getattr(obj, self._value)
+    
+    def __set__(self, obj, value):
+        setattr(obj, self._value, value)
+        setattr(obj, self._iso, None)
+    
+    def isoformat(self, obj):
+        """Return the attribute's value on obj as an ISO 8601 string."""
+        iso = getattr(obj, self._iso)
+        if iso is None:
+            iso = getattr(obj, self._value).isoformat()
+            setattr(obj, self._iso, iso)
+        return iso
 
 
 class MockUser:
     """Mock user for testing."""
     
+    __slots__ = ("id", "username", "email", "user_type", "_created_at", "_created_at_iso", "active")
+    
+    created_at = _Timestamp()
+    
     def __init__(self, id=None, username=None, email=None, user_type="student"):
-        self.id = id or random.randint(1, 1000)
+        self.id = id or _next_id()
         self.username = username or f"user_{self.id}"
         self.email = email or f"{self.username}@example.com"
         self.user_type = user_type
@@ -117,7 +300,7 @@ class MockUser:
             "username": self.username,
             "email": self.email,
             "user_type": self.user_type,
-            "created_at": self.created_at.isoformat(),
+            "created_at": MockUser.created_at.isoformat(self),
             "active": self.active
         }
 
@@ -125,8 +308,14 @@ class MockUser:
 class MockCourse:
     """Mock course for testing."""
     
+    __slots__ = ("id", "title", "description", "creator_id", "_created_at", "_created_at_iso",
+                 "_updated_at", "_updated_at_iso", "active", "lessons")
+    
+    created_at = _Timestamp()
+    updated_at = _Timestamp()
+    
     def __init__(self, id=None, title=None, description=None, creator_id=None):
-        self.id = id or random.randint(1, 1000)
+        self.id = id or _next_id()
         self.title = title or f"Course {self.id}"
         self.description = description or f"Description for course {self.id}"
         self.creator_id = creator_id or random.randint(1, 100)
@@ -148,18 +337,81 @@ class MockCourse:
             "title": self.title,
             "description": self.description,
             "creator_id": self.creator_id,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": MockCourse.created_at.isoformat(self),
+            "updated_at": MockCourse.updated_at.isoformat(self),
             "active": self.active,
             "lessons": [lesson.to_dict() for lesson in self.lessons]
         }
 
 
+class MockCourseTable:
+    """
+    Column-oriented store for many mock courses.
+    
+    Tests that need hundreds of courses can append rows here instead of
+    building a MockCourse object per course.
+    """
+    
+    def __init__(self):
+        self.ids = []
+        self.titles = []
+        self.descriptions = []
+        self.creator_ids = []
+        self.created_ats = []
+        self.active = []
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def append(self, id=None, title=None, description=None, creator_id=None, created_at=None):
+        """Append one course and return its row index."""
+        course_id = id or _next_id()
+        self.ids.append(course_id)
+        self.titles.append(title or f"Course {course_id}")
+        self.descriptions.append(description or f"Description for course {course_id}")
+        self.creator_ids.append(creator_id or random.randint(1, 100))
+        self.created_ats.append(created_at or datetime.now())
+        self.active.append(True)
+        return len(self.ids) - 1
+    
+    def row(self, i):
+        """Build a MockCourse for one row."""
+        course = MockCourse(self.ids[i], self.titles[i], self.descriptions[i], self.creator_ids[i])
+        course.created_at = course.updated_at = self.created_ats[i]
+        course.active = self.active[i]
+        return course
+    
+    def to_dict_all(self):
+        """Convert every course to a dictionary, as MockCourse.to_dict would."""
+        return [
+            {
+                "id": course_id,
+                "title": title,
+                "description": description,
+                "creator_id": creator_id,
+                "created_at": created,
+                "updated_at": created,
+                "active": active,
+                "lessons": []
+            }
+            for course_id, title, description, creator_id, created, active in zip(
+                self.ids, self.titles, self.descriptions, self.creator_ids,
+                [created_at.isoformat() for created_at in self.created_ats], self.active
+            )
+        ]
+
+
 class MockLesson:
     """Mock lesson for testing."""
     
+    __slots__ = ("id", "title", "content", "course_id", "order", "_created_at", "_created_at_iso",
+                 "_updated_at", "_updated_at_iso", "exercises")
+    
+    created_at = _Timestamp()
+    updated_at = _Timestamp()
+    
     def __init__(self, id=None, title=None, content=None, course_id=None, order=None):
-        self.id = id or random.randint(1, 1000)
+        self.id = id or _next_id()
         self.title = title or f"Lesson {self.id}"
         self.content = content or f"Content for lesson {self.id}"
         self.course_id = course_id
@@ -182,8 +434,8 @@ class MockLesson:
             "content": self.content,
             "course_id": self.course_id,
             "order": self.order,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": MockLesson.created_at.isoformat(self),
+            "updated_at": MockLesson.updated_at.isoformat(self),
             "exercises": [exercise.to_dict() for exercise in self.exercises]
         }
 
@@ -191,15 +443,22 @@ class MockLesson:
 class MockExercise:
     """Mock exercise for testing."""
     
+    __slots__ = ("id", "lesson_id", "question", "exercise_type", "_answer_options", "correct_answer",
+                 "_created_at", "_created_at_iso", "_updated_at", "_updated_at_iso", "_options_json")
+    
+    created_at = _Timestamp()
+    updated_at = _Timestamp()
+    
     def __init__(self, id=None, lesson_id=None, question=None, 
                  exercise_type="multiple_choice", answer_options=None, correct_answer=None):
-        self.id = id or random.randint(1, 1000)
+        self.id = id or _next_id()
         self.lesson_id = lesson_id
         self.question = question or f"Question for exercise {self.id}"
         self.exercise_type = exercise_type
         
+        # Options are kept as a list and only serialized to JSON by to_dict
         if exercise_type == "multiple_choice":
-            self.answer_options = answer_options or json.dumps([f"Option {i}" for i in range(1, 5)])
+            self.answer_options = answer_options or [f"Option {i}" for i in range(1, 5)]
             self.correct_answer = correct_answer or "Option 1"
         else:
             self.answer_options = answer_options
@@ -214,11 +473,35 @@ class MockExercise:
             try:
                 answered = json.loads(answer)
                 return self.correct_answer in answered
-            except:
+            except (TypeError, ValueError):
                 return False
         else:
             return answer == self.correct_answer
     
+    @property
+    def answer_options(self):
+        """Answer options, as a list or a JSON string."""
+        return self._answer_options
+    
+    @answer_options.setter
+    def answer_options(self, options):
+        self._answer_options = options
+        # Serialized again by options_json() on next use
+        self._options_json = None
+    
+    def options_json(self):
+        """
+        Return the answer options as JSON, serializing them only once.
+        
+        The cached JSON is dropped when answer_options is reassigned, not
+        when the options list is changed in place.
+        """
+        if self._options_json is None:
+            options = self._answer_options
+            # Options given as a JSON string are passed through unchanged
+            self._options_json = options if options is None or isinstance(options, str) else json.dumps(options)
+        return self._options_json
+    
     def to_dict(self):
         """Convert exercise to dictionary."""
         return {
@@ -226,18 +509,22 @@ class MockExercise:
             "lesson_id": self.lesson_id,
             "question": self.question,
             "exercise_type": self.exercise_type,
-            "answer_options": self.answer_options,
+            "answer_options": self.options_json(),
             "correct_answer": self.correct_answer,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
+            "created_at": MockExercise.created_at.isoformat(self),
+            "updated_at": MockExercise.updated_at.isoformat(self)
         }
 
 
 class MockSubmission:
     """Mock submission for testing."""
     
+    __slots__ = ("id", "user_id", "exercise_id", "answer_text", "is_correct", "_created_at", "_created_at_iso")
+    
+    created_at = _Timestamp()
+    
     def __init__(self, id=None, user_id=None, exercise_id=None, answer_text=None):
-        self.id = id or random.randint(1, 1000)
+        self.id = id or _next_id()
         self.user_id = user_id or random.randint(1, 100)
         self.exercise_id = exercise_id
         self.answer_text = answer_text or ""
@@ -252,27 +539,43 @@ class MockSubmission:
             "exercise_id": self.exercise_id,
             "answer_text": self.answer_text,
             "is_correct": self.is_correct,
-            "created_at": self.created_at.isoformat()
+            "created_at": MockSubmission.created_at.isoformat(self)
         }
 
 
 # Mock HTTP/API objects
 
+# Read-only headers shared by every response that doesn't set its own
+_DEFAULT_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+
+
 class MockResponse:
     """Mock HTTP response for testing."""
     
+    __slots__ = ("status_code", "data", "headers")
+    
     def __init__(self, status_code=200, data=None, headers=None):
         self.status_code = status_code
-        self.data = data or {}
-        self.headers = headers or {"Content-Type": "application/json"}
+        self.data = data if data is not None else {}
+        self.headers = headers or _DEFAULT_HEADERS
     
     def json(self):
         """Return JSON data."""
+        # Read-only payloads of shared responses are handed out as fresh dicts
+        if isinstance(self.data, MappingProxyType):
+            return dict(self.data)
         return self.data
     
     def text(self):
         """Return text data."""
-        return json.dumps(self.data)
+        return json.dumps(self.json())
+
+
+# Canned responses for the error paths, shared between calls. Their payloads
+# are read-only, and json() gives each caller its own copy.
+_NOT_FOUND_ENDPOINT = MockResponse(404, MappingProxyType({"error": "Endpoint not found"}))
+_NOT_FOUND_COURSE = MockResponse(404, MappingProxyType({"error": "Course not found"}))
+_NO_CONTENT = MockResponse(204, MappingProxyType({}))
 
 
 class MockAPIClient:
@@ -289,56 +592,126 @@ class MockAPIClient:
         self.token = token
         self.headers["Authorization"] = f"Bearer {token}"
     
+    # Route handlers
+    
+    def _list_courses(self, params=None):
+        courses = [course.copy() for course in self.mock_database.data["courses"].values()]
+        return MockResponse(200, courses)
+    
+    def _get_course(self, course_id, params=None):
+        course = self.mock_database.get("courses", course_id)
+        if not course:
+            return _NOT_FOUND_COURSE
+        return MockResponse(200, course)
+    
+    def _login(self, data=None, json_data=None):
+        return MockResponse(200, {"access_token": "mock_token"})
+    
+    def _register(self, data=None, json_data=None):
+        user_id = self.mock_database.insert("users", json_data)
+        return MockResponse(201, {"id": user_id})
+    
+    def _update_course(self, course_id, data=None, json_data=None):
+        success = self.mock_database.update("courses", course_id, json_data)
+        if not success:
+            return _NOT_FOUND_COURSE
+        return MockResponse(200, self.mock_database.get("courses", course_id))
+    
+    def _delete_course(self, course_id):
+        success = self.mock_database.delete("courses", course_id)
+        if not success:
+            return _NOT_FOUND_COURSE
+        return _NO_CONTENT
+    
+    # Exact endpoints: (method, endpoint) -> handler
+    _ROUTES = {
+        ("GET", "/courses"): _list_courses,
+        ("POST", "/auth/login"): _login,
+        ("POST", "/auth/register"): _register,
+    }
+    
+    # Endpoints ending in an ID: (method, prefix) -> handler taking the ID
+    _ID_ROUTES = {
+        ("GET", "/courses/"): _get_course,
+        ("PUT", "/courses/"): _update_course,
+        ("DELETE", "/courses/"): _delete_course,
+    }
+    
+    def _dispatch(self, method, endpoint, *args):
+        """Look up the handler for a request with two dict lookups."""
+        handler = self._ROUTES.get((method, endpoint))
+        if handler:
+            return handler(self, *args)
+        
+        # "/courses/<id>" and nested paths such as "/courses/<id>/lessons"
+        # are handled by the route for their first segment
+        parts = endpoint.split("/", 3)
+        if len(parts) > 2:
+            handler = self._ID_ROUTES.get((method, f"/{parts[1]}/"))
+            if handler:
+                try:
+                    resource_id = int(parts[2])
+                except ValueError:
+                    return _NOT_FOUND_ENDPOINT
+                return handler(self, resource_id, *args)
+        return _NOT_FOUND_ENDPOINT
+    
     def get(self, endpoint, params=None):
         """Mock GET request."""
-        # Implement mock API endpoints here
-        if endpoint == "/courses":
-            courses = list(self.mock_database.data["courses"].values())
-            return MockResponse(200, courses)
-        elif endpoint.startswith("/courses/"):
-            course_id = int(endpoint.split("/")[2])
-            course = self.mock_database.get("courses", course_id)
-            if not course:
-                return MockResponse(404, {"error": "Course not found"})
-            return MockResponse(200, course)
-        # Add more endpoints as needed
-        return MockResponse(404, {"error": "Endpoint not found"})
+        return self._dispatch("GET", endpoint, params)
     
     def post(self, endpoint, data=None, json_data=None):
         """Mock POST request."""
-        if endpoint == "/auth/login":
-            return MockResponse(200, {"access_token": "mock_token"})
-        elif endpoint == "/auth/register":
-            user_id = self.mock_database.insert("users", json_data)
-            return MockResponse(201, {"id": user_id})
-        # Add more endpoints as needed
-        return MockResponse(404, {"error": "Endpoint not found"})
+        return self._dispatch("POST", endpoint, data, json_data)
     
     def put(self, endpoint, data=None, json_data=None):
         """Mock PUT request."""
-        if endpoint.startswith("/courses/"):
-            course_id = int(endpoint.split("/")[2])
-            success = self.mock_database.update("courses", course_id, json_data)
-            if not success:
-                return MockResponse(404, {"error": "Course not found"})
-            return MockResponse(200, self.mock_database.get("courses", course_id))
-        # Add more endpoints as needed
-        return MockResponse(404, {"error": "Endpoint not found"})
+        return self._dispatch("PUT", endpoint, data, json_data)
     
     def delete(self, endpoint):
         """Mock DELETE request."""
-        if endpoint.startswith("/courses/"):
-            course_id = int(endpoint.split("/")[2])
-            success = self.mock_database.delete("courses", course_id)
-            if not success:
-                return MockResponse(404, {"error": "Course not found"})
-            return MockResponse(204)
-        # Add more endpoints as needed
-        return MockResponse(404, {"error": "Endpoint not found"})
+        return self._dispatch("DELETE", endpoint)
 
 
 # Mock database session
 
+class _FakeQuery:
+    """
+    Minimal stand-in for a SQLAlchemy query over one mock table.
+    
+    Records are only turned into model objects when all(), first() or get()
+    is called. filter() ignores its arguments because SQL expressions aren't
+    evaluated; filter_by() matches records on exact column values.
+    """
+    
+    __slots__ = ("_records", "_model")
+    
+    def __init__(self, records, model):
+        self._records = records
+        self._model = model
+    
+    def all(self):
+        return [self._model(**record) for record in self._records.values()]
+    
+    def first(self):
+        record = next(iter(self._records.values()), None)
+        return self._model(**record) if record is not None else None
+    
+    def get(self, record_id):
+        record = self._records.get(record_id)
+        return self._model(**record) if record is not None else None
+    
+    def filter(self, *criteria, **kwargs):
+        return self
+    
+    def filter_by(self, **kwargs):
+        records = {
+            record_id: record for record_id, record in self._records.items()
+            if all(record.get(key) == value for key, value in kwargs.items())
+        }
+        return _FakeQuery(records, self._model)
+
+
 class MockSession:
     """Mock database session for testing."""
     
@@ -356,6 +729,21 @@ class MockSession:
             table_name = obj.__class__.__name__.lower() + 's'  # Simple pluralization
             obj.id = self.mock_database.insert(table_name, obj_dict)
     
+    def add_all(self, objs):
+        """Add several objects, inserting them one table at a time."""
+        by_table = {}
+        for obj in objs:
+            if hasattr(obj, 'to_dict'):
+                table_name = obj.__class__.__name__.lower() + 's'  # Simple pluralization
+                by_table.setdefault(table_name, []).append(obj)
+        
+        for table_name, table_objs in by_table.items():
+            record_ids = self.mock_database.insert_many(
+                table_name, [obj.to_dict() for obj in table_objs]
+            )
+            for obj, record_id in zip(table_objs, record_ids):
+                obj.id = record_id
+    
     def commit(self):
         """Commit the session."""
         self.committed = True
@@ -370,12 +758,8 @@ class MockSession:
     
     def query(self, model):
         """Create a query object."""
-        query = MagicMock()
         table_name = model.__name__.lower() + 's'  # Simple pluralization
-        
-        # Configure the mock to return data from our mock database
-        query.all.return_value = [model(**record) for record in self.mock_database.data.get(table_name, {}).values()]
-        query.first.return_value = next(iter([model(**record) for record in self.mock_database.data.get(table_name, {}).values()]), None)
+        query = _FakeQuery(self.mock_database.data.get(table_name, {}), model)
         
         # Store in query_results for later inspection
         self.query_results[model.__name__] = query
@@ -24,17 +24,22 @@ import string
 import json
 from datetime import datetime, timedelta
 import tempfile
+import uuid
+
+# Characters used for random test strings
+_ALPHABET = string.ascii_letters + string.digits
 
 # Add pytest fixtures that can be shared across test types
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def random_string():
     """
     Generate a random string for test data.
     
     This fixture returns a function that creates random strings with optional prefix.
     The generated strings can be used for usernames, emails, and other test data
-    where unique values are needed.
+    where unique values are needed. The function is stateless, so one instance
+    is shared by the whole session.
     
     Returns:
         callable: Function that generates random strings
@@ -47,8 +52,7 @@ def random_string():
         ```
     """
     def _random_string(length=10, prefix="test_"):
-        characters = string.ascii_letters + string.digits
-        random_str = ''.join(random.choice(characters) for _ in range(length))
+        random_str = ''.join(random.choices(_ALPHABET, k=length))
         return f"{prefix}{random_str}"
     return _random_string
 
@@ -75,6 +79,47 @@ def temp_dir():
     with tempfile.TemporaryDirectory() as tmpdirname:
         yield tmpdirname
 
+@pytest.fixture(scope="session")
+def session_temp_dir():
+    """
+    Create one temporary directory shared by the whole test session.
+    
+    Unlike temp_dir, nothing is removed after each test; the directory and
+    everything in it are deleted once when the session ends. Tests that need
+    their own directory should use temp_subdir instead of writing here directly.
+    
+    Yields:
+        str: Path to the session's temporary directory
+    """
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        yield tmpdirname
+
+@pytest.fixture
+def temp_subdir(session_temp_dir):
+    """
+    Create a uniquely named directory inside session_temp_dir.
+    
+    The directory is left in place after the test and removed together with
+    session_temp_dir, so tests that create many files skip the per-test cleanup
+    that temp_dir does.
+    
+    Args:
+        session_temp_dir: Session-wide temporary directory fixture
+        
+    Returns:
+        Path: Path to the new, empty directory
+        
+    Example:
+        ```
+        def test_export(temp_subdir):
+            export_path = temp_subdir / "courses.json"
+            export_path.write_text("[]")
+        ```
+    """
+    path = Path(session_temp_dir) / uuid.uuid4().hex
+    path.mkdir()
+    return path
+
 @pytest.fixture
 def temp_file():
     """
@@ -98,9 +143,15 @@ def temp_file():
         ```
     """
     with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        yield tmp.name
-        if os.path.exists(tmp.name):
-            os.unlink(tmp.name)
+        name = tmp.name
+    try:
+        yield name
+    finally:
+        # The test may already have removed the file
+        try:
+            os.unlink(name)
+        except FileNotFoundError:
+            pass
 
 @pytest.fixture
 def sample_course_data(random_string):
@@ -257,8 +308,8 @@ def assert_dict_contains_subset(subset, full_dict):
     Assert that full_dict contains all key-value pairs from subset.
     
     This utility function checks that all key-value pairs in the subset dictionary
-    are present in the full dictionary. It raises an AssertionError if any key
-    is missing or if any value doesn't match.
+    are present in the full dictionary. It raises an AssertionError listing every
+    missing key, or every value that doesn't match.
     
     Args:
         subset (dict): Dictionary with key-value pairs to check for
@@ -274,9 +325,16 @@ def assert_dict_contains_subset(subset, full_dict):
         assert_dict_contains_subset({"username": "jane"}, user_data)  # Fails
         ```
     """
-    for key, value in subset.items():
-        assert key in full_dict, f"Key '{key}' not found in dictionary"
-        assert full_dict[key] == value, f"Value mismatch for key '{key}': expected {value}, got {full_dict[key]}"
+    missing = subset.keys() - full_dict.keys()
+    assert not missing, f"Keys not found in dictionary: {sorted(missing, key=repr)}"
+    
+    # Compare the pairs as views first; only build the mismatch report on failure
+    if subset.items() <= full_dict.items():
+        return
+    mismatches = {
+        key: (value, full_dict[key]) for key, value in subset.items() if full_dict[key] != value
+    }
+    assert not mismatches, f"Value mismatches (expected, got): {mismatches}"
 
 def generate_date_range(days=30):
     """
@@ -0,0 +1,170 @@
+-- Schema update 1.0.4, run by update_schema.py as a single batch.
+-- Indexes are created separately by update_schema.py, outside the transaction.
+-- Every statement is idempotent so the file can be re-run safely.
+
+-- New tables, in dependency order
+CREATE TABLE IF NOT EXISTS students (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL,
+    full_name VARCHAR(100) NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP,
+    is_active BOOLEAN DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS tests (
+    id SERIAL PRIMARY KEY,
+    title VARCHAR(100) NOT NULL,
+    description TEXT,
+    duration_minutes INTEGER NOT NULL,
+    randomize_questions BOOLEAN DEFAULT FALSE,
+    passing_score DECIMAL(5,2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_by INTEGER REFERENCES students(id),
+    is_active BOOLEAN DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS test_questions (
+    id SERIAL PRIMARY KEY,
+    test_id INTEGER REFERENCES tests(id) ON DELETE CASCADE,
+    exercise_id INTEGER REFERENCES exercises(id) ON DELETE CASCADE,
+    question_order INTEGER NOT NULL,
+    weight DECIMAL(5,2) DEFAULT 1.0,
+    is_required BOOLEAN DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS student_tests (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER REFERENCES students(id) ON DELETE CASCADE,
+    test_id INTEGER REFERENCES tests(id) ON DELETE CASCADE,
+    assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    due_at TIMESTAMP,
+    max_attempts INTEGER DEFAULT 1,
+    attempts_used INTEGER DEFAULT 0,
+    UNIQUE (student_id, test_id)
+);
+
+CREATE TABLE IF NOT EXISTS submission_answers (
+    id SERIAL PRIMARY KEY,
+    submission_id INTEGER REFERENCES submissions(id) ON DELETE CASCADE,
+    question_id INTEGER REFERENCES test_questions(id) ON DELETE CASCADE,
+    exercise_id INTEGER REFERENCES exercises(id),
+    answer_data JSONB NOT NULL,
+    is_correct BOOLEAN,
+    score DECIMAL(5,2),
+    feedback TEXT,
+    graded_at TIMESTAMP,
+    graded_by VARCHAR(100),
+    grading_notes TEXT
+);
+
+CREATE TABLE IF NOT EXISTS scores (
+    id SERIAL PRIMARY KEY,
+    submission_id INTEGER REFERENCES submissions(id) ON DELETE CASCADE,
+    student_id INTEGER REFERENCES students(id),
+    test_id INTEGER REFERENCES tests(id),
+    total_score DECIMAL(5,2) NOT NULL,
+    max_possible_score DECIMAL(5,2) NOT NULL,
+    percentage DECIMAL(5,2) GENERATED ALWAYS AS (total_score / NULLIF(max_possible_score, 0) * 100) STORED,
+    graded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_passing BOOLEAN,
+    attempt_number INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS query_logs (
+    id SERIAL PRIMARY KEY,
+    query_text TEXT NOT NULL,
+    execution_time_ms INTEGER NOT NULL,
+    params JSONB,
+    username VARCHAR(100),
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    source_ip VARCHAR(45),
+    session_id VARCHAR(100)
+);
+
+CREATE TABLE IF NOT EXISTS error_logs (
+    id SERIAL PRIMARY KEY,
+    error_code VARCHAR(50),
+    error_message TEXT NOT NULL,
+    error_stack TEXT,
+    severity VARCHAR(20) NOT NULL,
+    component VARCHAR(100),
+    username VARCHAR(100),
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    source_ip VARCHAR(45),
+    session_id VARCHAR(100),
+    request_data JSONB
+);
+
+CREATE TABLE IF NOT EXISTS auth_logs (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(100) NOT NULL,
+    action VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    reason TEXT,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    source_ip VARCHAR(45) NOT NULL,
+    user_agent TEXT
+);
+
+CREATE TABLE IF NOT EXISTS submission_logs (
+    id SERIAL PRIMARY KEY,
+    submission_id INTEGER REFERENCES submissions(id) ON DELETE CASCADE,
+    student_id INTEGER REFERENCES students(id),
+    test_id INTEGER REFERENCES tests(id),
+    action VARCHAR(50) NOT NULL,
+    details JSONB,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    source_ip VARCHAR(45),
+    session_id VARCHAR(100)
+);
+
+-- Columns the submissions table needs
+ALTER TABLE submissions
+    ADD COLUMN IF NOT EXISTS test_id INTEGER REFERENCES tests(id) ON DELETE CASCADE,
+    ADD COLUMN IF NOT EXISTS started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS submitted_at TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS completion_time_minutes INTEGER,
+    ADD COLUMN IF NOT EXISTS status VARCHAR(20) DEFAULT 'in_progress',
+    ADD COLUMN IF NOT EXISTS ip_address VARCHAR(45),
+    ADD COLUMN IF NOT EXISTS user_agent TEXT,
+    ADD COLUMN IF NOT EXISTS total_score DECIMAL(5,2),
+    ADD COLUMN IF NOT EXISTS is_passing BOOLEAN,
+    ADD COLUMN IF NOT EXISTS attempt_number INTEGER DEFAULT 1;
+
+-- Test completion status for each assigned test
+CREATE OR REPLACE VIEW test_completion_status AS
+SELECT 
+    st.student_id,
+    s.username as student_username,
+    st.test_id,
+    t.title as test_title,
+    st.assigned_at,
+    st.due_at,
+    st.max_attempts,
+    st.attempts_used,
+    CASE 
+        WHEN st.attempts_used >= st.max_attempts THEN 'no_attempts_left'
+        WHEN st.due_at < CURRENT_TIMESTAMP THEN 'past_due'
+        WHEN sub.passed THEN 'passed'
+        WHEN sub.in_progress THEN 'in_progress'
+        ELSE 'not_started'
+    END as status
+FROM 
+    student_tests st
+JOIN 
+    students s ON st.student_id = s.id
+JOIN 
+    tests t ON st.test_id = t.id
+-- Both status flags come from one pass over submissions
+LEFT JOIN (
+    SELECT
+        student_id,
+        test_id,
+        bool_or(status = 'graded' AND is_passing) as passed,
+        bool_or(status = 'in_progress') as in_progress
+    FROM submissions
+    GROUP BY student_id, test_id
+) sub ON sub.student_id = st.student_id AND sub.test_id = st.test_id;